@@ -0,0 +1,134 @@
+# /* BatchEvaluator.py
+
+from __future__ import annotations
+import numpy as np
+
+from typing import Literal, TYPE_CHECKING
+from data.classes.Bitboard import (
+    WHITE, BLACK, KNIGHT, BISHOP, ROOK, QUEEN, KING, COLORS, PIECE_TYPES,
+    KNIGHT_ATTACKS, KING_ATTACKS, RAYS, BETWEEN, bit_squares
+)
+from data.classes.Evaluation import Evaluation, DEFAULT_EVALUATION, MAX_PHASE
+if TYPE_CHECKING:
+    from data.classes.Board import Board
+
+# Boards are encoded as (N, 64) int8 arrays in Board.squares order: 0 for an
+# empty square, piece type + 1 for white pieces, -(piece type + 1) for black.
+
+def _bool_matrix(table: list[int]) -> np.ndarray:
+    matrix = np.zeros((64, 64), dtype=bool)
+    for sq in range(64):
+        matrix[sq, bit_squares(table[sq])] = True
+    return matrix
+
+KNIGHT_MATRIX = _bool_matrix(KNIGHT_ATTACKS).astype(np.int32)
+KING_MATRIX = _bool_matrix(KING_ATTACKS).astype(np.int32)
+# [from, to]: the squares share a rank/file (rook) or diagonal (bishop)
+ROOK_LINES = _bool_matrix([RAYS[0][sq] | RAYS[1][sq] | RAYS[4][sq] | RAYS[5][sq]
+                           for sq in range(64)])
+BISHOP_LINES = _bool_matrix([RAYS[2][sq] | RAYS[3][sq] | RAYS[6][sq] | RAYS[7][sq]
+                             for sq in range(64)])
+
+# [from * 64 + to, k]: square k lies strictly between from and to
+def _between_matrix() -> np.ndarray:
+    matrix = np.zeros((4096, 64), dtype=np.float32)
+    for from_sq in range(64):
+        for to_sq in range(64):
+            matrix[from_sq * 64 + to_sq, bit_squares(BETWEEN[from_sq][to_sq])] = 1
+    return matrix
+
+BETWEEN_MATRIX = _between_matrix()
+
+def encode_board(board: Board) -> np.ndarray:
+    output = np.zeros(64, dtype=np.int8)
+    for i, square in enumerate(board.squares):
+        piece = square.occupying_piece
+        if piece is not None:
+            code = PIECE_TYPES[piece.notation] + 1
+            output[i] = code if piece.color == 'white' else -code
+    return output
+
+def encode_boards(boards: list[Board]) -> np.ndarray:
+    if len(boards) < 1:
+        return np.zeros((0, 64), dtype=np.int8)
+    return np.stack([encode_board(board) for board in boards])
+
+def one_hot(encoded: np.ndarray) -> np.ndarray:
+    """
+    (N, 64) codes to (N, 12, 64) planes: white pawn..king, black pawn..king.
+    """
+    planes = np.zeros((encoded.shape[0], 12, 64), dtype=np.int8)
+    for ptype in range(6):
+        planes[:, ptype] = encoded == ptype + 1
+        planes[:, 6 + ptype] = encoded == -(ptype + 1)
+    return planes
+
+class BatchEvaluator:
+    """
+    Scores many positions at once with the same material, piece-square
+    table and phase terms as Evaluation/Board.evaluate, plus an optional
+    pseudo-legal mobility term (weight 0 by default so scores match the
+    scalar evaluation exactly).
+    """
+    def __init__(self, evaluation: Evaluation = DEFAULT_EVALUATION,
+                 mobility_weight: int = 0):
+        self.mobility_weight = mobility_weight
+        # Rows indexed by piece code + 6
+        self.middlegame = np.zeros((13, 64), dtype=np.int64)
+        self.endgame = np.zeros((13, 64), dtype=np.int64)
+        self.phase = np.zeros(13, dtype=np.int64)
+        for color, sign in ((WHITE, 1), (BLACK, -1)):
+            for ptype in range(6):
+                row = sign * (ptype + 1) + 6
+                self.middlegame[row] = evaluation.middlegame[color][ptype]
+                self.endgame[row] = evaluation.endgame[color][ptype]
+                self.phase[row] = evaluation.phase_weights[ptype]
+
+    def material(self, encoded: np.ndarray) -> np.ndarray:
+        """
+        Tapered material + piece-square score of each position, white's view.
+        """
+        rows = encoded.astype(np.int64) + 6
+        middlegame = self.middlegame[rows, np.arange(64)].sum(axis=1)
+        endgame = self.endgame[rows, np.arange(64)].sum(axis=1)
+        phase = np.minimum(self.phase[rows].sum(axis=1), MAX_PHASE)
+        return (middlegame * phase + endgame * (MAX_PHASE - phase)) // MAX_PHASE
+
+    def mobility(self, encoded: np.ndarray) -> np.ndarray:
+        """
+        Pseudo-legal knight, bishop, rook, queen and king moves (to empty or
+        enemy squares) of white minus those of black.
+        """
+        occupied = (encoded != 0).astype(np.float32)
+        # clear[n, from, to]: nothing stands between from and to
+        clear = (occupied @ BETWEEN_MATRIX.T).reshape(-1, 64, 64) == 0
+        rook_reach = (clear & ROOK_LINES).astype(np.int32)
+        bishop_reach = (clear & BISHOP_LINES).astype(np.int32)
+        output = np.zeros(encoded.shape[0], dtype=np.int64)
+        for sign in (1, -1):
+            free = (encoded * sign <= 0).astype(np.int32)
+            count = (
+                np.einsum('ns,st,nt->n', self._pieces(encoded, sign, KNIGHT), KNIGHT_MATRIX, free)
+                + np.einsum('ns,st,nt->n', self._pieces(encoded, sign, KING), KING_MATRIX, free)
+                + np.einsum('ns,nst,nt->n', self._pieces(encoded, sign, ROOK, QUEEN),
+                            rook_reach, free)
+                + np.einsum('ns,nst,nt->n', self._pieces(encoded, sign, BISHOP, QUEEN),
+                            bishop_reach, free)
+            )
+            output += sign * count
+        return output
+
+    def _pieces(self, encoded: np.ndarray, sign: int, *ptypes: int) -> np.ndarray:
+        return np.isin(encoded, [sign * (ptype + 1) for ptype in ptypes]).astype(np.int32)
+
+    def evaluate(self, positions: list[Board] | np.ndarray,
+                 color: Literal['white', 'black'] = 'white') -> np.ndarray:
+        """
+        Scores of a batch of boards (or an (N, 64) encoding) in centipawns
+        for `color`, matching MinimaxPlayer(color).evaluate_board.
+        """
+        encoded = positions if isinstance(positions, np.ndarray) else encode_boards(positions)
+        scores = self.material(encoded)
+        if self.mobility_weight:
+            scores = scores + self.mobility_weight * self.mobility(encoded)
+        return scores if COLORS[color] == WHITE else -scores
@@ -0,0 +1,308 @@
+# /* Bitboard.py
+
+from typing import Literal
+
+# Square index of (x, y) is y * 8 + x, so bit 0 is the top-left square (x=0,
+# y=0, black's queenside rook) and bit 63 is the bottom-right square.
+WHITE, BLACK = 0, 1
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+COLORS: dict[str, int] = {'white': WHITE, 'black': BLACK}
+COLOR_NAMES: tuple[Literal['white'], Literal['black']] = ('white', 'black')
+PIECE_TYPES: dict[str, int] = {
+    ' ': PAWN, 'N': KNIGHT, 'B': BISHOP, 'R': ROOK, 'Q': QUEEN, 'K': KING
+}
+NOTATIONS: tuple[str, ...] = (' ', 'N', 'B', 'R', 'Q', 'K')
+
+FULL = (1 << 64) - 1
+
+def _on_board(x: int, y: int) -> bool:
+    return 0 <= x < 8 and 0 <= y < 8
+
+def _step_table(steps: list[tuple[int, int]]) -> list[int]:
+    table = []
+    for sq in range(64):
+        x, y = sq % 8, sq // 8
+        bb = 0
+        for dx, dy in steps:
+            if _on_board(x + dx, y + dy):
+                bb |= 1 << ((y + dy) * 8 + x + dx)
+        table.append(bb)
+    return table
+
+KNIGHT_ATTACKS = _step_table(
+    [(1, -2), (2, -1), (2, 1), (1, 2), (-1, 2), (-2, 1), (-2, -1), (-1, -2)]
+)
+KING_ATTACKS = _step_table(
+    [(0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
+)
+# White pawns move towards y = 0, black pawns towards y = 7
+PAWN_ATTACKS = (
+    _step_table([(-1, -1), (1, -1)]),
+    _step_table([(-1, 1), (1, 1)]),
+)
+
+# Ray directions. The first four increase the square index (so the nearest
+# blocker is the lowest set bit), the last four decrease it (highest bit).
+EAST, SOUTH, SOUTH_EAST, SOUTH_WEST, WEST, NORTH, NORTH_WEST, NORTH_EAST = range(8)
+_DIRECTIONS = [(1, 0), (0, 1), (1, 1), (-1, 1), (-1, 0), (0, -1), (-1, -1), (1, -1)]
+
+def _ray_table(dx: int, dy: int) -> list[int]:
+    table = []
+    for sq in range(64):
+        x, y = sq % 8 + dx, sq // 8 + dy
+        bb = 0
+        while _on_board(x, y):
+            bb |= 1 << (y * 8 + x)
+            x, y = x + dx, y + dy
+        table.append(bb)
+    return table
+
+RAYS = [_ray_table(dx, dy) for dx, dy in _DIRECTIONS]
+_E, _S, _SE, _SW, _W, _N, _NW, _NE = RAYS
+
+def rook_attacks(sq: int, occupied: int) -> int:
+    attacks = 0
+    for rays in (_E, _S):
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in (_W, _N):
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+def bishop_attacks(sq: int, occupied: int) -> int:
+    attacks = 0
+    for rays in (_SE, _SW):
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in (_NW, _NE):
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+def queen_attacks(sq: int, occupied: int) -> int:
+    return rook_attacks(sq, occupied) | bishop_attacks(sq, occupied)
+
+def bit_squares(bb: int) -> list[int]:
+    output = []
+    while bb:
+        lsb = bb & -bb
+        output.append(lsb.bit_length() - 1)
+        bb ^= lsb
+    return output
+
+def lsb_square(bb: int) -> int:
+    return (bb & -bb).bit_length() - 1
+
+# BETWEEN[a][b]: squares strictly between a and b when they share a rank,
+# file or diagonal, otherwise 0
+def _between_table() -> list[list[int]]:
+    table = [[0] * 64 for _ in range(64)]
+    for sq in range(64):
+        for dx, dy in _DIRECTIONS:
+            x, y, path = sq % 8 + dx, sq // 8 + dy, 0
+            while _on_board(x, y):
+                table[sq][y * 8 + x] = path
+                path |= 1 << (y * 8 + x)
+                x, y = x + dx, y + dy
+    return table
+
+BETWEEN = _between_table()
+
+FILE_A = sum(1 << (y * 8) for y in range(8))
+FILE_H = FILE_A << 7
+
+def pawn_attacks_all(color: int, pawns: int) -> int:
+    if color == WHITE:
+        return ((pawns & ~FILE_A) >> 9) | ((pawns & ~FILE_H) >> 7)
+    return (((pawns & ~FILE_A) << 7) | ((pawns & ~FILE_H) << 9)) & FULL
+
+# Position core: one 64-bit integer per (color, piece type)
+class Bitboard:
+    def __init__(self):
+        self.pieces: list[list[int]] = [[0] * 6, [0] * 6]
+        self.occupancy: list[int] = [0, 0]
+        self.occupied: int = 0
+
+    def copy(self) -> 'Bitboard':
+        new = Bitboard.__new__(Bitboard)
+        new.pieces = [self.pieces[WHITE][:], self.pieces[BLACK][:]]
+        new.occupancy = self.occupancy[:]
+        new.occupied = self.occupied
+        return new
+
+    def add(self, color: int, ptype: int, sq: int) -> None:
+        bit = 1 << sq
+        self.pieces[color][ptype] |= bit
+        self.occupancy[color] |= bit
+        self.occupied |= bit
+
+    def remove(self, color: int, ptype: int, sq: int) -> None:
+        mask = ~(1 << sq)
+        self.pieces[color][ptype] &= mask
+        self.occupancy[color] &= mask
+        self.occupied &= mask
+
+    def attacks(self, color: int, ptype: int, sq: int, occupied: int = None) -> int:
+        # Squares attacked by a piece on sq, ignoring what occupies them
+        if occupied is None:
+            occupied = self.occupied
+        if ptype == PAWN:
+            return PAWN_ATTACKS[color][sq]
+        if ptype == KNIGHT:
+            return KNIGHT_ATTACKS[sq]
+        if ptype == BISHOP:
+            return bishop_attacks(sq, occupied)
+        if ptype == ROOK:
+            return rook_attacks(sq, occupied)
+        if ptype == QUEEN:
+            return queen_attacks(sq, occupied)
+        return KING_ATTACKS[sq]
+
+    def targets(self, color: int, ptype: int, sq: int, has_moved: bool) -> int:
+        # Pseudo-legal destination squares, matching Piece.get_moves
+        if ptype != PAWN:
+            return self.attacks(color, ptype, sq) & ~self.occupancy[color]
+        output = PAWN_ATTACKS[color][sq] & self.occupancy[color ^ 1]
+        step = -8 if color == WHITE else 8
+        ahead = sq + step
+        if 0 <= ahead < 64 and not (self.occupied >> ahead) & 1:
+            output |= 1 << ahead
+            ahead += step
+            if not has_moved and 0 <= ahead < 64 and not (self.occupied >> ahead) & 1:
+                output |= 1 << ahead
+        return output
+
+    def attackers_to(self, sq: int, by_color: int, occupied: int = None,
+                     removed: int = 0) -> int:
+        # Pieces of by_color attacking sq. `removed` masks out pieces that
+        # are captured in a hypothetical position.
+        if occupied is None:
+            occupied = self.occupied
+        pcs = self.pieces[by_color]
+        keep = ~removed
+        rooks = (pcs[ROOK] | pcs[QUEEN]) & keep
+        bishops = (pcs[BISHOP] | pcs[QUEEN]) & keep
+        return (
+            (KNIGHT_ATTACKS[sq] & pcs[KNIGHT])
+            | (PAWN_ATTACKS[by_color ^ 1][sq] & pcs[PAWN])
+            | (KING_ATTACKS[sq] & pcs[KING])
+            | (rook_attacks(sq, occupied) & rooks if rooks else 0)
+            | (bishop_attacks(sq, occupied) & bishops if bishops else 0)
+        ) & keep
+
+    def attack_state(self, color: int) -> tuple[int, int, int, int, dict[int, int]]:
+        # Check and pin information for color's king:
+        # (king square, squares attacked by the enemy, checkers,
+        #  check mask, {pinned square: allowed squares})
+        # The enemy attack map is computed with color's king removed from the
+        # occupancy so the king cannot step back along a slider's ray.
+        them = color ^ 1
+        kings = self.pieces[color][KING]
+        if not kings:
+            return -1, 0, 0, FULL, {}
+        ksq = lsb_square(kings)
+        pcs = self.pieces[them]
+        occupied = self.occupied & ~kings
+        attacked = pawn_attacks_all(them, pcs[PAWN])
+        for sq in bit_squares(pcs[KNIGHT]):
+            attacked |= KNIGHT_ATTACKS[sq]
+        for sq in bit_squares(pcs[BISHOP] | pcs[QUEEN]):
+            attacked |= bishop_attacks(sq, occupied)
+        for sq in bit_squares(pcs[ROOK] | pcs[QUEEN]):
+            attacked |= rook_attacks(sq, occupied)
+        for sq in bit_squares(pcs[KING]):
+            attacked |= KING_ATTACKS[sq]
+        checkers = self.attackers_to(ksq, them)
+        if not checkers:
+            check_mask = FULL
+        elif checkers & (checkers - 1):
+            # double check: only king moves
+            check_mask = 0
+        else:
+            check_mask = checkers | BETWEEN[ksq][lsb_square(checkers)]
+        pins: dict[int, int] = {}
+        them_occupancy = self.occupancy[them]
+        snipers = (
+            (rook_attacks(ksq, them_occupancy) & (pcs[ROOK] | pcs[QUEEN]))
+            | (bishop_attacks(ksq, them_occupancy) & (pcs[BISHOP] | pcs[QUEEN]))
+        )
+        for sniper in bit_squares(snipers):
+            between = BETWEEN[ksq][sniper]
+            blockers = between & self.occupied
+            if blockers and not blockers & (blockers - 1) \
+               and blockers & self.occupancy[color]:
+                pins[lsb_square(blockers)] = between | (1 << sniper)
+        return ksq, attacked, checkers, check_mask, pins
+
+    def is_attacked(self, sq: int, by_color: int, occupied: int = None,
+                    removed: int = 0) -> bool:
+        # Same as attackers_to(...) != 0, but stops at the first attacker
+        if occupied is None:
+            occupied = self.occupied
+        pcs = self.pieces[by_color]
+        keep = ~removed
+        if KNIGHT_ATTACKS[sq] & pcs[KNIGHT] & keep \
+           or PAWN_ATTACKS[by_color ^ 1][sq] & pcs[PAWN] & keep \
+           or KING_ATTACKS[sq] & pcs[KING] & keep:
+            return True
+        rooks = (pcs[ROOK] | pcs[QUEEN]) & keep
+        if rooks and rook_attacks(sq, occupied) & rooks:
+            return True
+        bishops = (pcs[BISHOP] | pcs[QUEEN]) & keep
+        return bool(bishops and bishop_attacks(sq, occupied) & bishops)
+
+    def piece_type_at(self, color: int, sq: int) -> int:
+        bit = 1 << sq
+        pcs = self.pieces[color]
+        for ptype in range(6):
+            if pcs[ptype] & bit:
+                return ptype
+        return -1
+
+    def see(self, from_sq: int, to_sq: int, values: list[int]) -> int:
+        """
+        Static exchange evaluation of the capture from_sq -> to_sq: the
+        material balance for the moving side after both sides keep
+        recapturing on to_sq with their least valuable attacker (either
+        side may stop when continuing would lose material). Sliders
+        hidden behind a capturer join in as it leaves its square.
+        """
+        side = WHITE if self.occupancy[WHITE] & (1 << from_sq) else BLACK
+        victim = self.piece_type_at(side ^ 1, to_sq)
+        attacker = self.piece_type_at(side, from_sq)
+        gain = [values[victim] if victim >= 0 else 0]
+        occupied = self.occupied
+        from_bit = 1 << from_sq
+        while True:
+            gain.append(values[attacker] - gain[-1])
+            if max(-gain[-2], gain[-1]) < 0:
+                break
+            occupied ^= from_bit
+            side ^= 1
+            attackers = self.attackers_to(to_sq, side, occupied) & occupied
+            if not attackers:
+                break
+            pcs = self.pieces[side]
+            for attacker in range(6):
+                bb = attackers & pcs[attacker]
+                if bb:
+                    from_bit = bb & -bb
+                    break
+        # the last entry assumes a recapture that never happens
+        for d in range(len(gain) - 2, 0, -1):
+            gain[d - 1] = -max(-gain[d - 1], gain[d])
+        return gain[0]
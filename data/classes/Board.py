@@ -3,6 +3,7 @@
 import pygame
 import copy 
 
+from array import array
 from typing import Literal
 from data.classes.Square import Square
 from data.classes.Piece import Piece
@@ -12,16 +13,38 @@ from data.classes.pieces.Knight import Knight
 from data.classes.pieces.Queen import Queen
 from data.classes.pieces.King import King
 from data.classes.pieces.Pawn import Pawn
+from data.classes.Bitboard import (
+    Bitboard, COLORS, PIECE_TYPES, PAWN, KING, bit_squares, lsb_square
+)
+from data.classes.Move import QUEEN_PROMOTION, CASTLING
+from data.classes.Zobrist import PIECE_KEYS, SIDE_KEY, CASTLING_KEYS
+from data.classes.Evaluation import Evaluation, DEFAULT_EVALUATION
+
+STARTING_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+PIECE_CLASSES = {'R': Rook, 'N': Knight, 'B': Bishop, 'Q': Queen, 'K': King, 'P': Pawn}
+# (FEN castling letter, king start square, rook start square) as indices
+CASTLING_SQUARES = (('K', 60, 63), ('Q', 60, 56), ('k', 4, 7), ('q', 4, 0))
 
 # Game state checker
 class Board:
-    def __init__(self, display: pygame.surface.Surface, width: float, height: float):
+    # Pass display=None for a headless board: no sprites, rects or SDL calls.
+    # backend='bitboard' generates moves and check tests from a Bitboard
+    # kept in sync with the squares; backend='squares' walks the Square
+    # objects like the original implementation. fen sets up any position
+    # instead of the initial one (see from_fen).
+    def __init__(self, display: pygame.surface.Surface = None,
+                 width: float = 600, height: float = 600,
+                 backend: Literal['bitboard', 'squares'] = 'bitboard',
+                 fen: str = None):
         self.display = display
+        self.backend = backend
+        self.bitboard: Bitboard = Bitboard() if backend == 'bitboard' else None
         self.width = width
         self.height = height
         self.tile_width = width // 8
         self.tile_height = height // 8
         self.selected_square: Square = None
+        self.reset_rendering()
         self.turn: Literal['white', 'black'] = 'white'
         self.config = [
             ['bR', 'bN', 'bB', 'bQ', 'bK', 'bB', 'bN', 'bR'],
@@ -33,24 +56,173 @@ class Board:
             ['wP', 'wP', 'wP', 'wP', 'wP', 'wP', 'wP', 'wP'],
             ['wR', 'wN', 'wB', 'wQ', 'wK', 'wB', 'wN', 'wR'],
         ]
+        fields = None
+        if fen is not None:
+            fields = fen.split()
+            self.config = self.parse_placement(fields[0])
+        # Plies played before this board's first move, and the halfmove
+        # clock at that point, for the move counters of to_fen
+        self.start_ply = 0
+        self.start_halfmove = 0
         self.squares: list[Square] = self.generate_squares()
+        # One undo record per move played with make_move:
+        # (from_square, to_square, piece, captured, had_moved,
+        #  rook_from, rook_to, promoted, attack_states, hash, castling,
+        #  halfmove)
+        self.move_stack: list[tuple] = []
+        # Occurrences of each position (by hash) reached in this game, and
+        # plies since the last capture or pawn move, kept by make_move and
+        # unmake_move so draw checks cost O(1)
+        self.repetitions: dict[int, int] = {}
+        self.halfmove: int = 0
+        # Per-color Bitboard.attack_state of the current position, filled
+        # on demand and restored from the undo record by unmake_move
+        self._attack_states: list[tuple] = None
+        # Zobrist hash of pieces, side to move and castling rights, kept
+        # up to date by place_piece/remove_piece and make_move
+        self.hash: int = 0
+        self.castling: int = 0
+        # Evaluation totals (white minus black), kept up to date by
+        # place_piece/remove_piece so evaluate() is O(1)
+        self.evaluation: Evaluation = DEFAULT_EVALUATION
+        self.eval_middlegame: int = 0
+        self.eval_endgame: int = 0
+        self.phase: int = 0
         self.setup_board()
+        if fields is not None:
+            self.apply_fen_state(fields)
+        self.castling = self.get_castling_rights()
+        self.hash ^= CASTLING_KEYS[self.castling]
+        if self.turn == 'black':
+            self.hash ^= SIDE_KEY
+        self.halfmove = self.start_halfmove
+        self.repetitions[self.hash] = 1
+
+    # Board for a FEN position. Castling rights become has_moved flags on
+    # the king and rooks, and pawns off their starting rank count as moved
+    # so they cannot double-step. The en passant field is ignored, as this
+    # game has no en passant.
+    @classmethod
+    def from_fen(cls, fen: str, display: pygame.surface.Surface = None,
+                 width: float = 600, height: float = 600,
+                 backend: Literal['bitboard', 'squares'] = 'bitboard') -> 'Board':
+        return cls(display, width, height, backend, fen=fen)
+
+    # Pickles as its FEN and repetition counts, so positions can be sent
+    # to worker processes and still score repetitions of the game's
+    # earlier positions as draws (the move stack and display are not kept)
+    def __reduce__(self):
+        return (Board.from_fen, (self.to_fen(), None, self.width, self.height, self.backend),
+                {'repetitions': dict(self.repetitions)})
+
+    def parse_placement(self, placement: str) -> list[list[str]]:
+        rows = placement.split('/')
+        if len(rows) != 8:
+            raise ValueError(f'Bad FEN piece placement {placement}')
+        config = []
+        for row in rows:
+            config_row = []
+            for char in row:
+                if char.isdigit():
+                    config_row.extend([''] * int(char))
+                elif char.upper() in PIECE_CLASSES:
+                    config_row.append(('w' if char.isupper() else 'b') + char.upper())
+                else:
+                    raise ValueError(f'Bad FEN piece {char}')
+            if len(config_row) != 8:
+                raise ValueError(f'Bad FEN rank {row}')
+            config.append(config_row)
+        return config
+
+    def apply_fen_state(self, fields: list[str]) -> None:
+        self.turn = 'black' if len(fields) > 1 and fields[1] == 'b' else 'white'
+        castling = fields[2] if len(fields) > 2 else '-'
+        for square in self.squares:
+            piece = square.occupying_piece
+            if piece is None:
+                continue
+            if piece.notation == ' ':
+                piece.has_moved = square.y != (6 if piece.color == 'white' else 1)
+            elif piece.notation in 'KR':
+                piece.has_moved = True
+        for char, king_sq, rook_sq in CASTLING_SQUARES:
+            king = self.squares[king_sq].occupying_piece
+            rook = self.squares[rook_sq].occupying_piece
+            color = 'white' if char.isupper() else 'black'
+            if char in castling and king is not None and rook is not None \
+               and king.notation == 'K' and rook.notation == 'R' \
+               and king.color == color and rook.color == color:
+                king.has_moved = False
+                rook.has_moved = False
+        self.start_halfmove = int(fields[4]) if len(fields) > 4 else 0
+        fullmove = int(fields[5]) if len(fields) > 5 else 1
+        self.start_ply = 2 * (fullmove - 1) + (1 if self.turn == 'black' else 0)
+
+    # Plies since the last capture or pawn move, including those before
+    # the FEN this board started from
+    def halfmove_clock(self) -> int:
+        return self.halfmove
+
+    def to_fen(self) -> str:
+        rows = []
+        for y in range(8):
+            row = ''
+            empty = 0
+            for x in range(8):
+                piece = self.squares[y * 8 + x].occupying_piece
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    row += str(empty)
+                    empty = 0
+                letter = 'P' if piece.notation == ' ' else piece.notation
+                row += letter if piece.color == 'white' else letter.lower()
+            rows.append(row + (str(empty) if empty else ''))
+        rights = self.get_castling_rights()
+        castling = ''.join(char for bit, (char, _, _) in enumerate(CASTLING_SQUARES)
+                           if rights & (1 << bit))
+        fullmove = (self.start_ply + len(self.move_stack)) // 2 + 1
+        return ' '.join(['/'.join(rows), 'w' if self.turn == 'white' else 'b',
+                         castling or '-', '-', str(self.halfmove_clock()), str(fullmove)])
         
     # Custom deepcopy implementation
     def __deepcopy__(self, memo):
-        # Create a new board instance without copying the display
-        new_board = Board(None, self.width, self.height)
-        
-        # Deep copy all mutable attributes except for 'display'
-        # new_board.selected_square = copy.deepcopy(self.selected_square, memo)
+        # Create a headless board without running the initial setup, then
+        # copy the current position into it (pieces hold no board reference,
+        # so a shallow copy of each piece is enough)
+        new_board = Board.__new__(Board)
+        new_board.display = None
+        new_board.backend = self.backend
+        new_board.bitboard = None if self.bitboard is None else self.bitboard.copy()
+        new_board.width = self.width
+        new_board.height = self.height
+        new_board.tile_width = self.tile_width
+        new_board.tile_height = self.tile_height
         new_board.selected_square = None
+        new_board.reset_rendering()
         new_board.turn = self.turn
-        new_board.config = copy.deepcopy(self.config, memo)
-        new_board.squares = self.generate_squares()
-        
-        # Any other setup tasks can be handled here, like copying the board setup
-        new_board.setup_board()
-        
+        new_board.config = self.config
+        new_board.start_ply = self.start_ply + len(self.move_stack)
+        new_board.start_halfmove = self.halfmove_clock()
+        new_board.squares = new_board.generate_squares()
+        # Undo records refer to this board's squares, so the copy starts
+        # with an empty history
+        new_board.move_stack = []
+        new_board.repetitions = dict(self.repetitions)
+        new_board.halfmove = self.halfmove
+        new_board._attack_states = None
+        new_board.hash = self.hash
+        new_board.castling = self.castling
+        new_board.evaluation = self.evaluation
+        new_board.eval_middlegame = self.eval_middlegame
+        new_board.eval_endgame = self.eval_endgame
+        new_board.phase = self.phase
+        for square, new_square in zip(self.squares, new_board.squares):
+            if square.occupying_piece is not None:
+                piece = copy.copy(square.occupying_piece)
+                piece.img = None
+                new_square.occupying_piece = piece
         return new_board
 
     def generate_squares(self) -> list[Square]:
@@ -63,9 +235,9 @@ class Board:
         return output
 
     def get_square_from_pos(self, pos: tuple[float, float]) -> Square:
-        for square in self.squares:
-            if (square.x, square.y) == (pos[0], pos[1]):
-                return square
+        x, y = int(pos[0]), int(pos[1])
+        if 0 <= x < 8 and 0 <= y < 8:
+            return self.squares[y * 8 + x]
 
     def get_piece_from_pos(self, pos: tuple[float, float]) -> Piece:
         return self.get_square_from_pos(pos).occupying_piece
@@ -79,47 +251,332 @@ class Board:
         for y, row in enumerate(self.config):
             for x, piece in enumerate(row):
                 if piece != '':
-                    square = self.get_square_from_pos((x, y))
-                    # looking inside contents, what piece does it have
-                    if piece[1] == 'R':
-                        square.occupying_piece = Rook(
-                            (x, y), 'white' if piece[0] == 'w' else 'black', self
-                        )
-                    # as you notice above, we put `self` as argument, or means our class Board
-                    elif piece[1] == 'N':
-                        square.occupying_piece = Knight(
-                            (x, y), 'white' if piece[0] == 'w' else 'black', self
-                        )
-                    elif piece[1] == 'B':
-                        square.occupying_piece = Bishop(
-                            (x, y), 'white' if piece[0] == 'w' else 'black', self
-                        )
-                    elif piece[1] == 'Q':
-                        square.occupying_piece = Queen(
-                            (x, y), 'white' if piece[0] == 'w' else 'black', self
-                        )
-                    elif piece[1] == 'K':
-                        square.occupying_piece = King(
-                            (x, y), 'white' if piece[0] == 'w' else 'black', self
-                        )
-                    elif piece[1] == 'P':
-                        square.occupying_piece = Pawn(
-                            (x, y), 'white' if piece[0] == 'w' else 'black', self
-                        )
+                    self.place_piece(
+                        PIECE_CLASSES[piece[1]]((x, y), 'white' if piece[0] == 'w' else 'black', self),
+                        self.squares[y * 8 + x]
+                    )
 
-    def handle_move(self, from_square: Square, to_square: Square) -> bool:
-        print('from_square.occupying_piece : ', from_square.occupying_piece)
-        if from_square is not None and from_square.occupying_piece.move(self, to_square):
-            self.turn = 'white' if self.turn == 'black' else 'black'
-            return True
+    # All changes to the position go through these three methods so the
+    # bitboard backend stays in sync with the squares
+    def place_piece(self, piece: Piece, square: Square) -> None:
+        piece.pos, piece.x, piece.y = square.pos, square.x, square.y
+        square.occupying_piece = piece
+        self._attack_states = None
+        c, t, i = COLORS[piece.color], PIECE_TYPES[piece.notation], square.y * 8 + square.x
+        self.hash ^= PIECE_KEYS[c][t][i]
+        evaluation = self.evaluation
+        self.eval_middlegame += evaluation.middlegame[c][t][i]
+        self.eval_endgame += evaluation.endgame[c][t][i]
+        self.phase += evaluation.phase_weights[t]
+        if self.bitboard is not None:
+            self.bitboard.add(c, t, i)
+
+    def remove_piece(self, square: Square) -> Piece:
+        piece = square.occupying_piece
+        if piece is not None:
+            square.occupying_piece = None
+            self._attack_states = None
+            c, t, i = COLORS[piece.color], PIECE_TYPES[piece.notation], square.y * 8 + square.x
+            self.hash ^= PIECE_KEYS[c][t][i]
+            evaluation = self.evaluation
+            self.eval_middlegame -= evaluation.middlegame[c][t][i]
+            self.eval_endgame -= evaluation.endgame[c][t][i]
+            self.phase -= evaluation.phase_weights[t]
+            if self.bitboard is not None:
+                self.bitboard.remove(c, t, i)
+        return piece
+
+    # Returns the captured piece, if any
+    def move_piece(self, from_square: Square, to_square: Square) -> Piece:
+        captured = self.remove_piece(to_square)
+        self.place_piece(self.remove_piece(from_square), to_square)
+        return captured
+
+    # Pieces on the board, kings included: a popcount with the bitboard
+    def piece_count(self) -> int:
+        if self.bitboard is not None:
+            return self.bitboard.occupied.bit_count()
+        return sum(1 for square in self.squares if square.occupying_piece is not None)
+
+    # Static evaluation in centipawns from white's point of view
+    def evaluate(self) -> int:
+        return self.evaluation.blend(self.eval_middlegame, self.eval_endgame, self.phase)
+
+    # Switches to another evaluation configuration and recomputes the totals
+    def set_evaluation(self, evaluation: Evaluation) -> None:
+        self.evaluation = evaluation
+        self.eval_middlegame = self.eval_endgame = self.phase = 0
+        for i, square in enumerate(self.squares):
+            piece = square.occupying_piece
+            if piece is not None:
+                c, t = COLORS[piece.color], PIECE_TYPES[piece.notation]
+                self.eval_middlegame += evaluation.middlegame[c][t][i]
+                self.eval_endgame += evaluation.endgame[c][t][i]
+                self.phase += evaluation.phase_weights[t]
+
+    # Bitmask of castling rights: 1 white kingside, 2 white queenside,
+    # 4 black kingside, 8 black queenside. A right exists while the king and
+    # that rook are unmoved on their starting squares.
+    def get_castling_rights(self) -> int:
+        rights = 0
+        for y, color, shift in ((7, 'white', 0), (0, 'black', 2)):
+            king = self.squares[y * 8 + 4].occupying_piece
+            if king is None or king.notation != 'K' or king.color != color \
+               or king.has_moved:
+                continue
+            for x, bit in ((7, 1), (0, 2)):
+                rook = self.squares[y * 8 + x].occupying_piece
+                if rook is not None and rook.notation == 'R' \
+                   and rook.color == color and not rook.has_moved:
+                    rights |= bit << shift
+        return rights
+
+    # Zobrist hash computed from scratch (the incremental one must match it)
+    def compute_hash(self) -> int:
+        output = 0
+        for i, square in enumerate(self.squares):
+            piece = square.occupying_piece
+            if piece is not None:
+                output ^= PIECE_KEYS[COLORS[piece.color]][PIECE_TYPES[piece.notation]][i]
+        if self.turn == 'black':
+            output ^= SIDE_KEY
+        return output ^ CASTLING_KEYS[self.get_castling_rights()]
+
+    # Pseudo-legal moves of a piece, generated from the bitboard
+    def get_bitboard_moves(self, piece: Piece) -> list[Square]:
+        squares = self.squares
+        return [squares[i] for i in bit_squares(self.bitboard.targets(
+            COLORS[piece.color], PIECE_TYPES[piece.notation],
+            piece.y * 8 + piece.x, piece.has_moved
+        ))]
+
+    # King square, enemy attack map, checkers and pins for color, computed
+    # once per position from the bitboard
+    def get_attack_state(self, color: Literal['white', 'black']) -> tuple:
+        if self._attack_states is None:
+            self._attack_states = [None, None]
+        c = COLORS[color]
+        state = self._attack_states[c]
+        if state is None:
+            state = self._attack_states[c] = self.bitboard.attack_state(c)
+        return state
+
+    # Legal moves of a piece (castling excluded), decided from the attack
+    # state instead of trial-moving the piece
+    def get_bitboard_valid_moves(self, piece: Piece,
+                                 captures_only: bool = False) -> list[Square]:
+        ksq, attacked, checkers, check_mask, pins = self.get_attack_state(piece.color)
+        sq = piece.y * 8 + piece.x
+        c = COLORS[piece.color]
+        targets = self.bitboard.targets(
+            c, PIECE_TYPES[piece.notation], sq, piece.has_moved
+        )
+        if captures_only:
+            targets &= self.bitboard.occupancy[c ^ 1]
+        if sq == ksq:
+            targets &= ~attacked
         else:
+            targets &= check_mask
+            if sq in pins:
+                targets &= pins[sq]
+        squares = self.squares
+        return [squares[i] for i in bit_squares(targets)]
+
+    # Every legal (from_square, to_square) pair for color
+    def get_all_valid_moves(self, color: Literal['white', 'black']) \
+                            -> list[tuple[Square, Square]]:
+        output: list[tuple[Square, Square]] = []
+        if self.bitboard is not None:
+            squares = [self.squares[i] for i in bit_squares(self.bitboard.occupancy[COLORS[color]])]
+        else:
+            squares = self.squares
+        for square in squares:
+            piece = square.occupying_piece
+            if piece is not None and piece.color == color:
+                for target in piece.get_valid_moves(self):
+                    output.append((square, target))
+        return output
+
+    # Legal captures for color (castling is never a capture)
+    def get_all_valid_captures(self, color: Literal['white', 'black']) \
+                               -> list[tuple[Square, Square]]:
+        output: list[tuple[Square, Square]] = []
+        if self.bitboard is None:
+            for square, target in self.get_all_valid_moves(color):
+                if target.occupying_piece is not None:
+                    output.append((square, target))
+            return output
+        for i in bit_squares(self.bitboard.occupancy[COLORS[color]]):
+            square = self.squares[i]
+            for target in self.get_bitboard_valid_moves(square.occupying_piece, True):
+                output.append((square, target))
+        return output
+
+    # Plays a move if it is legal for the side to move; False (and nothing
+    # played) for an empty from square, the opponent's piece or an
+    # illegal target
+    def handle_move(self, from_square: Square, to_square: Square) -> bool:
+        if from_square is None or from_square.occupying_piece is None \
+           or from_square.occupying_piece.color != self.turn:
             return False
+        return from_square.occupying_piece.move(self, to_square)
+
+    # 16-bit code of a move in this position (layout in Move.py): from and
+    # to square indices, plus the promotion or castling bits taken from
+    # the piece on the from square (0 means no move)
+    def encode_move(self, move: tuple[Square, Square]) -> int:
+        from_square, to_square = move
+        code = (from_square.y * 8 + from_square.x) | ((to_square.y * 8 + to_square.x) << 6)
+        piece = from_square.occupying_piece
+        if piece is not None:
+            if piece.notation == ' ' and (to_square.y == 0 or to_square.y == 7):
+                code |= QUEEN_PROMOTION
+            elif piece.notation == 'K' and abs(from_square.x - to_square.x) == 2:
+                code |= CASTLING
+        return code
+
+    # Square pair of a move code, for agents and make_move
+    def decode_move(self, move: int) -> tuple[Square, Square]:
+        return self.squares[move & 63], self.squares[(move >> 6) & 63]
+
+    # Writes the codes of every legal move for the side to move (only the
+    # captures with captures_only) into output, a preallocated array('H')
+    # such as Move.move_buffer(), and returns how many there are. Same
+    # moves in the same order as get_all_valid_moves, without building
+    # Square pairs.
+    def generate_move_codes(self, output: array, captures_only: bool = False) -> int:
+        color = self.turn
+        count = 0
+        if self.bitboard is None:
+            moves = self.get_all_valid_captures(color) if captures_only \
+                else self.get_all_valid_moves(color)
+            for move in moves:
+                output[count] = self.encode_move(move)
+                count += 1
+            return count
+        bitboard = self.bitboard
+        c = COLORS[color]
+        ksq, attacked, checkers, check_mask, pins = self.get_attack_state(color)
+        enemy = bitboard.occupancy[c ^ 1]
+        squares = self.squares
+        for sq in bit_squares(bitboard.occupancy[c]):
+            piece = squares[sq].occupying_piece
+            ptype = PIECE_TYPES[piece.notation]
+            targets = bitboard.targets(c, ptype, sq, piece.has_moved)
+            if captures_only:
+                targets &= enemy
+            if sq == ksq:
+                targets &= ~attacked
+            else:
+                targets &= check_mask
+                if sq in pins:
+                    targets &= pins[sq]
+            while targets:
+                lsb = targets & -targets
+                to_sq = lsb.bit_length() - 1
+                targets ^= lsb
+                if ptype == PAWN and (to_sq < 8 or to_sq >= 56):
+                    output[count] = sq | (to_sq << 6) | QUEEN_PROMOTION
+                else:
+                    output[count] = sq | (to_sq << 6)
+                count += 1
+            if ptype == KING and not captures_only and not piece.has_moved:
+                if piece.can_castle_side(self, 'queenside'):
+                    output[count] = sq | ((sq - 2) << 6) | CASTLING
+                    count += 1
+                if piece.can_castle_side(self, 'kingside'):
+                    output[count] = sq | ((sq + 2) << 6) | CASTLING
+                    count += 1
+        return count
+
+    # Plays a move that is known to be legal and pushes an undo record.
+    # Handles captures, has_moved flags, castling and promotion, and passes
+    # the turn to the other side.
+    def make_move(self, move: tuple[Square, Square]) -> None:
+        self.make_square_move(move[0], move[1])
+
+    # make_move for a move code, without building its Square pair
+    def make_move_code(self, move: int) -> None:
+        squares = self.squares
+        self.make_square_move(squares[move & 63], squares[(move >> 6) & 63])
+
+    def make_square_move(self, from_square: Square, to_square: Square) -> None:
+        attack_states = self._attack_states
+        old_hash = self.hash
+        piece = from_square.occupying_piece
+        had_moved = piece.has_moved
+        captured = self.move_piece(from_square, to_square)
+        piece.has_moved = True
+        rook_from: Square = None
+        rook_to: Square = None
+        promoted: Piece = None
+        if piece.notation == 'K' and abs(from_square.x - to_square.x) == 2:
+            # Move rook if king castles
+            if to_square.x < from_square.x:
+                rook_from = self.squares[to_square.y * 8]
+                rook_to = self.squares[to_square.y * 8 + 3]
+            else:
+                rook_from = self.squares[to_square.y * 8 + 7]
+                rook_to = self.squares[to_square.y * 8 + 5]
+            self.move_piece(rook_from, rook_to)
+            rook_to.occupying_piece.has_moved = True
+        elif piece.notation == ' ' and (to_square.y == 0 or to_square.y == 7):
+            # Pawn promotion
+            self.remove_piece(to_square)
+            promoted = Queen(to_square.pos, piece.color, self)
+            self.place_piece(promoted, to_square)
+        self.move_stack.append((from_square, to_square, piece, captured,
+                                had_moved, rook_from, rook_to, promoted,
+                                attack_states, old_hash, self.castling, self.halfmove))
+        self.turn = 'white' if self.turn == 'black' else 'black'
+        self.hash ^= SIDE_KEY
+        if piece.notation == ' ' or captured is not None:
+            self.halfmove = 0
+        else:
+            self.halfmove += 1
+        # Rights can only be lost when a king or rook moves or a rook is taken
+        if self.castling and (piece.notation in 'KR' or
+                              (captured is not None and captured.notation == 'R')):
+            castling = self.get_castling_rights()
+            if castling != self.castling:
+                self.hash ^= CASTLING_KEYS[self.castling] ^ CASTLING_KEYS[castling]
+                self.castling = castling
+        self.repetitions[self.hash] = self.repetitions.get(self.hash, 0) + 1
+
+    # Takes back the last move played with make_move
+    def unmake_move(self) -> None:
+        from_square, to_square, piece, captured, had_moved, \
+            rook_from, rook_to, promoted, attack_states, \
+            old_hash, castling, halfmove = self.move_stack.pop()
+        count = self.repetitions[self.hash] - 1
+        if count > 0:
+            self.repetitions[self.hash] = count
+        else:
+            del self.repetitions[self.hash]
+        if promoted is not None:
+            self.remove_piece(to_square)
+            self.place_piece(piece, from_square)
+        else:
+            self.move_piece(to_square, from_square)
+        piece.has_moved = had_moved
+        if captured is not None:
+            self.place_piece(captured, to_square)
+        if rook_from is not None:
+            self.move_piece(rook_to, rook_from)
+            rook_from.occupying_piece.has_moved = False
+        self._attack_states = attack_states
+        self.hash = old_hash
+        self.castling = castling
+        self.halfmove = halfmove
+        self.turn = 'white' if self.turn == 'black' else 'black'
 
     # check state checker
     def is_in_check(self, color: Literal['white', 'black'],
                     board_change: tuple[tuple[int, int],
                                         tuple[int, int]]=None) -> bool:
         # board_change = [(x1, y1), (x2, y2)]
+        if self.bitboard is not None:
+            return self._bitboard_in_check(color, board_change)
         output = False
         king_pos: tuple[int, int] = None
         changing_piece: Piece = None
@@ -157,24 +614,109 @@ class Board:
             new_square.occupying_piece = new_square_old_piece
         return output
 
-    # checkmate state checker
-    def is_in_checkmate(self, color: Literal['white', 'black']):
-        if not self.is_in_check(color):
+    # Answers the same question as is_in_check without touching the squares:
+    # the hypothetical move is applied to the occupancy masks only
+    def _bitboard_in_check(self, color: Literal['white', 'black'],
+                           board_change: tuple[tuple[int, int],
+                                               tuple[int, int]]=None) -> bool:
+        if board_change is None:
+            return self.get_attack_state(color)[2] != 0
+        bitboard = self.bitboard
+        us = COLORS[color]
+        kings = bitboard.pieces[us][KING]
+        (x1, y1), (x2, y2) = board_change
+        from_bit = 1 << (int(y1) * 8 + int(x1))
+        to_bit = 1 << (int(y2) * 8 + int(x2))
+        if kings & from_bit:
+            kings = (kings & ~from_bit) | to_bit
+        if not kings:
             return False
-        for piece in [i.occupying_piece for i in self.squares]:
+        occupied = (bitboard.occupied & ~from_bit) | to_bit
+        if not bitboard.occupancy[us] & from_bit:
+            # the moving piece is not ours: it replaces whatever was on to_bit
+            return bitboard.is_attacked(lsb_square(kings), us ^ 1, occupied)
+        return bitboard.is_attacked(lsb_square(kings), us ^ 1, occupied,
+                                    removed=to_bit)
+
+    # True if color has a legal move (stops at the first piece that can move)
+    def has_valid_move(self, color: Literal['white', 'black']) -> bool:
+        for square in self.squares:
+            piece = square.occupying_piece
             if piece != None and piece.color == color \
                 and len(piece.get_valid_moves(self)) > 0:
-                return False
-        return True
+                return True
+        return False
+
+    # checkmate state checker
+    def is_in_checkmate(self, color: Literal['white', 'black']):
+        return self.is_in_check(color) and not self.has_valid_move(color)
 
-    def draw(self, display: pygame.surface.Surface = None):
+    # stalemate state checker: not in check, but no legal move
+    def is_in_stalemate(self, color: Literal['white', 'black']):
+        return not self.is_in_check(color) and not self.has_valid_move(color)
+
+    # The current position has occurred three times (it is hashed with the
+    # side to move and castling rights; this game has no en passant)
+    def is_threefold_repetition(self) -> bool:
+        return self.repetitions.get(self.hash, 0) >= 3
+
+    # A hundred plies without a capture or a pawn move
+    def is_fifty_move_draw(self) -> bool:
+        return self.halfmove >= 100
+
+    # Forget what draw() last put on screen, so the next frame is drawn in
+    # full (after the window was covered or resized, for instance)
+    def reset_rendering(self) -> None:
+        # (highlight, sprite) each square was last drawn with, and where
+        self._drawn: list[tuple[bool, pygame.surface.Surface]] = None
+        self._drawn_display: pygame.surface.Surface = None
+        # Squares lit for the current selection, and the (selection,
+        # position) they were computed for
+        self._highlights: set[Square] = set()
+        self._highlight_key: tuple[Square, int] = None
+        self._clock: pygame.time.Clock = None
+
+    # The selected square and its piece's legal targets, recomputed only
+    # when the selection or the position changes
+    def get_highlighted_squares(self) -> set[Square]:
+        key = (self.selected_square, self.hash)
+        if key != self._highlight_key:
+            self._highlight_key = key
+            self._highlights = set()
+            square = self.selected_square
+            if square is not None and square.occupying_piece is not None:
+                self._highlights.add(square)
+                self._highlights.update(square.occupying_piece.get_valid_moves(self))
+        return self._highlights
+
+    # Redraws only the squares whose highlight or piece changed since the
+    # last frame and updates just their rects. With max_fps, waits so that
+    # a loop calling draw runs at most that many frames per second.
+    def draw(self, display: pygame.surface.Surface = None, max_fps: int = None):
         if display == None:
             display = self.display
-        display.fill('white')
-        if self.selected_square is not None:
-            self.selected_square.highlight = True
-            for square in self.selected_square.occupying_piece.get_valid_moves(self):
-                square.highlight = True
-        for square in self.squares:
-            square.draw(display)
-        pygame.display.update()
\ No newline at end of file
+        if display == None:
+            return
+        if max_fps is not None:
+            if self._clock is None:
+                self._clock = pygame.time.Clock()
+            self._clock.tick(max_fps)
+        full = self._drawn is None or self._drawn_display is not display
+        if full:
+            display.fill('white')
+            self._drawn = [None] * 64
+            self._drawn_display = display
+        highlights = self.get_highlighted_squares()
+        dirty: list[pygame.Rect] = []
+        for i, square in enumerate(self.squares):
+            square.highlight = square in highlights
+            piece = square.occupying_piece
+            state = (square.highlight, None if piece is None else piece.img)
+            if state != self._drawn[i]:
+                square.draw(display)
+                self._drawn[i] = state
+                dirty.append(square.rect)
+        if full:
+            pygame.display.update()
+        elif len(dirty) > 0:
+            pygame.display.update(dirty)
\ No newline at end of file
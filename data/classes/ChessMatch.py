@@ -1,44 +1,168 @@
+import random
+import time
 import pygame
 
+from dataclasses import dataclass, field
+from typing import Iterator, Literal
 from data.classes.Board import Board
+from data.classes.Square import Square
+from data.classes.Telemetry import QUIET, MOVES, ITERATIONS
 from data.classes.agents.ChessAgent import ChessAgent
 
-def chess_match(white_player: ChessAgent, black_player: ChessAgent):
+@dataclass
+class MatchResult:
+    white: str
+    black: str
+    # None for a draw
+    winner: Literal['white', 'black'] | None
+    # 'checkmate', 'stalemate', 'repetition' (threefold), 'fifty_moves',
+    # 'move_limit', 'invalid_move' or 'no_move' (an agent returned False
+    # while it still had legal moves)
+    termination: str
+    seed: int | None = None
+    # Coordinate moves such as 'e2e4', with a trailing 'q' on promotions
+    moves: list[str] = field(default_factory=list)
+    # Seconds each choose_action call took, one per entry in moves
+    latencies: list[float] = field(default_factory=list)
+    # Starting position, None for the standard one
+    fen: str | None = None
+
+    @property
+    def result(self) -> str:
+        if self.winner == 'white':
+            return '1-0'
+        if self.winner == 'black':
+            return '0-1'
+        return '1/2-1/2'
+
+    def color_latencies(self, color: Literal['white', 'black']) -> list[float]:
+        first = 'black' if self.fen is not None and self.fen.split()[1] == 'b' else 'white'
+        return self.latencies[0 if color == first else 1::2]
+
+    def mean_latency(self, color: Literal['white', 'black']) -> float:
+        own = self.color_latencies(color)
+        return sum(own) / len(own) if len(own) > 0 else 0.0
+
+def move_name(move: tuple[Square, Square]) -> str:
+    from_square, to_square = move
+    name = from_square.coord + to_square.coord
+    if from_square.occupying_piece.notation == ' ' and to_square.y in (0, 7):
+        name += 'q'
+    return name
+
+def run_match(white_player: ChessAgent, black_player: ChessAgent,
+              seed: int = None, max_moves: int = 1000,
+              display: bool = False, view_result: bool = False,
+              verbosity: int = QUIET, fen: str = None) -> MatchResult:
+    """
+    Plays one game and returns its MatchResult. The board is headless
+    unless display is set (HumanPlayer needs it); view_result keeps the
+    window open on the final position until it is closed; verbosity MOVES
+    prints the outcome and ITERATIONS every action. seed seeds the
+    random module before the first move. The game is drawn by stalemate,
+    threefold repetition, the fifty-move rule, or once max_moves moves
+    (plies) have been played. fen sets up another starting position.
+    """
     assert(white_player.color == 'white')
     assert(black_player.color == 'black')
-    pygame.init()
-    WINDOW_SIZE = (600, 600)
-    # # screen = pygame.display.set_mode(WINDOW_SIZE, pygame.RESIZABLE | pygame.NOFRAME)  # Windowed and without frame
-    screen = pygame.display.set_mode(WINDOW_SIZE)
-    # screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-    board = Board(screen, screen.get_width(), screen.get_height())
+    if seed is not None:
+        random.seed(seed)
+    if display:
+        pygame.init()
+        WINDOW_SIZE = (600, 600)
+        screen = pygame.display.set_mode(WINDOW_SIZE)
+        board = Board(screen, screen.get_width(), screen.get_height(), fen=fen)
+    else:
+        board = Board(fen=fen)
     agents: list[ChessAgent] = [white_player, black_player]
-    i: int = 0
-    moves_count: int = 0
+    result = MatchResult(type(white_player).__name__, type(black_player).__name__,
+                         None, 'move_limit', seed, fen=fen)
+    i: int = 0 if board.turn == 'white' else 1
 
-    # Run the main game loop
-    running = True
-    while running:
+    while len(result.moves) < max_moves:
+        mover = board.turn
+        waiting = agents[(i + 1) % len(agents)]
+        waiting.opponent_turn_started(board)
+        start = time.perf_counter()
         chosen_action = agents[i].choose_action(board)
-        print('chosen action', chosen_action)
+        latency = time.perf_counter() - start
+        waiting.opponent_turn_ended(board)
         i = (i + 1) % len(agents)
-        moves_count += 1
-        if chosen_action == False or moves_count > 1000:
-            print('Players draw!')
-            running = False
-        elif not board.handle_move(*chosen_action):
-            print("Invalid move!")
-        elif board.is_in_checkmate(board.turn):
-            if board.turn == 'white':
-                print('Black wins!')
+        if chosen_action == False:
+            if len(board.get_all_valid_moves(mover)) > 0:
+                result.termination = 'no_move'
+            elif board.is_in_check(mover):
+                result.winner = 'black' if mover == 'white' else 'white'
+                result.termination = 'checkmate'
             else:
-                print('White wins!')
-            running = False
-        board.draw()
+                result.termination = 'stalemate'
+            break
+        # checked before naming the move, which reads the moving piece
+        piece = chosen_action[0].occupying_piece
+        valid = piece is not None and piece.color == mover
+        name = move_name(chosen_action) if valid else None
+        if verbosity >= ITERATIONS:
+            print('chosen action', name)
+        if not valid or not board.handle_move(*chosen_action):
+            result.winner = 'black' if mover == 'white' else 'white'
+            result.termination = 'invalid_move'
+            break
+        result.moves.append(name)
+        result.latencies.append(latency)
+        if display:
+            board.draw()
+        if not board.has_valid_move(board.turn):
+            if board.is_in_check(board.turn):
+                result.winner = mover
+                result.termination = 'checkmate'
+            else:
+                result.termination = 'stalemate'
+            break
+        if board.is_threefold_repetition():
+            result.termination = 'repetition'
+            break
+        if board.is_fifty_move_draw():
+            result.termination = 'fifty_moves'
+            break
+
+    if verbosity >= MOVES:
+        if result.termination == 'invalid_move':
+            print('Invalid move!')
+        if result.winner == 'white':
+            print('White wins!')
+        elif result.winner == 'black':
+            print('Black wins!')
+        else:
+            print('Players draw!')
 
     # Allow the player to view the result
-    viewing = True
+    viewing = display and view_result
     while viewing:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                viewing = False
\ No newline at end of file
+                viewing = False
+    return result
+
+def iter_matches(n: int, white_player: ChessAgent, black_player: ChessAgent,
+                 seed: int = None, max_moves: int = 1000,
+                 **kwargs) -> Iterator[MatchResult]:
+    """
+    Plays n headless games between the same agents, yielding each result
+    as soon as its game ends. Game i is seeded with seed + i, so a run can
+    be repeated game by game.
+    """
+    for i in range(n):
+        yield run_match(white_player, black_player,
+                        seed=None if seed is None else seed + i,
+                        max_moves=max_moves, **kwargs)
+
+def run_matches(n: int, white_player: ChessAgent, black_player: ChessAgent,
+                seed: int = None, max_moves: int = 1000,
+                **kwargs) -> list[MatchResult]:
+    # All results of iter_matches
+    return list(iter_matches(n, white_player, black_player, seed, max_moves, **kwargs))
+
+def chess_match(white_player: ChessAgent, black_player: ChessAgent,
+                fen: str = None) -> MatchResult:
+    return run_match(white_player, black_player, display=True,
+                     view_result=True, verbosity=MOVES, fen=fen)
@@ -0,0 +1,140 @@
+# /* Evaluation.py
+
+from data.classes.Bitboard import WHITE, BLACK, NOTATIONS
+
+# Piece weights in pawns, the default material configuration
+PIECE_WEIGHTS = {
+    " ": 1,
+    "N": 3,
+    "B": 3,
+    "R": 5,
+    "Q": 9,
+    # Assign a very high value to the king to avoid losing it
+    "K": 1000
+}
+
+# Piece-square tables in centipawns from white's point of view. Index 0 is
+# a8 (x=0, y=0), the same square order as Board.squares, so white reads
+# table[sq] and black reads the vertically mirrored table[sq ^ 56].
+PAWN_TABLE = [
+      0,   0,   0,   0,   0,   0,   0,   0,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     10,  10,  20,  30,  30,  20,  10,  10,
+      5,   5,  10,  25,  25,  10,   5,   5,
+      0,   0,   0,  20,  20,   0,   0,   0,
+      5,  -5, -10,   0,   0, -10,  -5,   5,
+      5,  10,  10, -20, -20,  10,  10,   5,
+      0,   0,   0,   0,   0,   0,   0,   0,
+]
+PAWN_ENDGAME_TABLE = [
+      0,   0,   0,   0,   0,   0,   0,   0,
+     80,  80,  80,  80,  80,  80,  80,  80,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     30,  30,  30,  30,  30,  30,  30,  30,
+     20,  20,  20,  20,  20,  20,  20,  20,
+     10,  10,  10,  10,  10,  10,  10,  10,
+      0,   0,   0,   0,   0,   0,   0,   0,
+      0,   0,   0,   0,   0,   0,   0,   0,
+]
+KNIGHT_TABLE = [
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -30,   5,  15,  20,  20,  15,   5, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   5,  10,  15,  15,  10,   5, -30,
+    -40, -20,   0,   5,   5,   0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+]
+BISHOP_TABLE = [
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,  10,  10,   5,   0, -10,
+    -10,   5,   5,  10,  10,   5,   5, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,  10,  10,  10,  10,  10,  10, -10,
+    -10,   5,   0,   0,   0,   0,   5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+]
+ROOK_TABLE = [
+      0,   0,   0,   0,   0,   0,   0,   0,
+      5,  10,  10,  10,  10,  10,  10,   5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+      0,   0,   0,   5,   5,   0,   0,   0,
+]
+QUEEN_TABLE = [
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,   5,   5,   5,   0, -10,
+     -5,   0,   5,   5,   5,   5,   0,  -5,
+      0,   0,   5,   5,   5,   5,   0,  -5,
+    -10,   5,   5,   5,   5,   5,   0, -10,
+    -10,   0,   5,   0,   0,   0,   0, -10,
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+]
+KING_TABLE = [
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+     20,  20,   0,   0,   0,   0,  20,  20,
+     20,  30,  10,   0,   0,  10,  30,  20,
+]
+KING_ENDGAME_TABLE = [
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10,   0,   0, -10, -20, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -30,   0,   0,   0,   0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+]
+
+# Indexed by bitboard piece type
+MIDDLEGAME_TABLES = [PAWN_TABLE, KNIGHT_TABLE, BISHOP_TABLE,
+                     ROOK_TABLE, QUEEN_TABLE, KING_TABLE]
+ENDGAME_TABLES = [PAWN_ENDGAME_TABLE, KNIGHT_TABLE, BISHOP_TABLE,
+                  ROOK_TABLE, QUEEN_TABLE, KING_ENDGAME_TABLE]
+# Game phase contributed by each piece; 24 with all minor and major pieces
+PHASE_WEIGHTS = [0, 1, 1, 2, 4, 0]
+MAX_PHASE = 24
+
+class Evaluation:
+    """
+    Material plus piece-square tables, blended between a middlegame and an
+    endgame score by the remaining non-pawn material. The tables are
+    folded into per-(color, piece type, square) terms, signed white minus
+    black, so Board can keep the totals up to date on every placement and
+    removal and a leaf evaluation is a single blend.
+    """
+    def __init__(self, piece_weights: dict[str, int] = PIECE_WEIGHTS,
+                 middlegame_tables: list[list[int]] = MIDDLEGAME_TABLES,
+                 endgame_tables: list[list[int]] = ENDGAME_TABLES,
+                 phase_weights: list[int] = PHASE_WEIGHTS):
+        self.piece_weights = piece_weights
+        self.middlegame: list[list[list[int]]] = [[], []]
+        self.endgame: list[list[list[int]]] = [[], []]
+        for ptype, notation in enumerate(NOTATIONS):
+            material = 100 * piece_weights[notation]
+            mg, eg = middlegame_tables[ptype], endgame_tables[ptype]
+            self.middlegame[WHITE].append([material + mg[sq] for sq in range(64)])
+            self.endgame[WHITE].append([material + eg[sq] for sq in range(64)])
+            self.middlegame[BLACK].append([-material - mg[sq ^ 56] for sq in range(64)])
+            self.endgame[BLACK].append([-material - eg[sq ^ 56] for sq in range(64)])
+        self.phase_weights = phase_weights
+
+    def blend(self, middlegame: int, endgame: int, phase: int) -> int:
+        """
+        Tapered score in centipawns from white's point of view.
+        """
+        phase = min(phase, MAX_PHASE)
+        return (middlegame * phase + endgame * (MAX_PHASE - phase)) // MAX_PHASE
+
+DEFAULT_EVALUATION = Evaluation()
@@ -0,0 +1,237 @@
+# /* GameRecord.py
+
+import datetime
+import json
+import re
+
+from typing import Iterator, Literal
+from data.classes.Board import Board
+from data.classes.Square import Square
+from data.classes.ChessMatch import MatchResult
+
+_UCI_MOVE = re.compile(r'^([a-h][1-8])([a-h][1-8])[qrbn]?$')
+_PGN_TAG = re.compile(r'^\[(\w+)\s+"(.*)"\]$')
+_PGN_RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+
+def square_from_coord(board: Board, coord: str) -> Square:
+    return board.get_square_from_pos(('abcdefgh'.index(coord[0]), 8 - int(coord[1])))
+
+def _san_body(board: Board, move: tuple[Square, Square],
+              legal: list[tuple[Square, Square]]) -> str:
+    from_square, to_square = move
+    piece = from_square.occupying_piece
+    if piece.notation == 'K' and abs(from_square.x - to_square.x) == 2:
+        return 'O-O' if to_square.x > from_square.x else 'O-O-O'
+    capture = 'x' if to_square.occupying_piece is not None else ''
+    if piece.notation == ' ':
+        output = (from_square.coord[0] + capture if capture else '') + to_square.coord
+        # Pawns always promote to a queen in this game
+        return output + '=Q' if to_square.y in (0, 7) else output
+    others = [other[0] for other in legal
+              if other[1] is to_square and other[0] is not from_square
+              and other[0].occupying_piece.notation == piece.notation]
+    disambiguation = ''
+    if len(others) > 0:
+        if all(other.x != from_square.x for other in others):
+            disambiguation = from_square.coord[0]
+        elif all(other.y != from_square.y for other in others):
+            disambiguation = from_square.coord[1]
+        else:
+            disambiguation = from_square.coord
+    return piece.notation + disambiguation + capture + to_square.coord
+
+def san(board: Board, move: tuple[Square, Square],
+        legal: list[tuple[Square, Square]] = None) -> str:
+    """
+    Standard algebraic notation of a legal move in the board's current
+    position, with '+' for check and '#' for mate.
+    """
+    if legal is None:
+        legal = board.get_all_valid_moves(board.turn)
+    output = _san_body(board, move, legal)
+    board.make_move(move)
+    if board.is_in_check(board.turn):
+        output += '#' if len(board.get_all_valid_moves(board.turn)) < 1 else '+'
+    board.unmake_move()
+    return output
+
+def parse_move(board: Board, text: str) -> tuple[Square, Square]:
+    """
+    Legal move for a coordinate ('e2e4', 'e7e8q') or SAN ('Nf3', 'exd5',
+    'O-O') string in the board's current position. Raises ValueError if
+    the move is malformed or illegal.
+    """
+    legal = board.get_all_valid_moves(board.turn)
+    match = _UCI_MOVE.match(text)
+    if match is not None:
+        move = (square_from_coord(board, match.group(1)), square_from_coord(board, match.group(2)))
+        if move in legal:
+            return move
+        raise ValueError(f'Illegal move {text}')
+    text = text.rstrip('+#!?').replace('0', 'O')
+    for move in legal:
+        if _san_body(board, move, legal) == text:
+            return move
+    raise ValueError(f'Illegal or malformed move {text}')
+
+def game_record(result: MatchResult, **extra) -> dict:
+    """
+    Serializable record of a finished game: agents, result, termination,
+    seed, starting FEN (None from the standard position), coordinate and
+    SAN moves, and per-move and total agent time. Extra keyword fields (a
+    game number, say) are added as they are.
+    """
+    board = Board.from_fen(result.fen) if result.fen else Board()
+    sans = []
+    for name in result.moves:
+        move = parse_move(board, name)
+        sans.append(san(board, move))
+        board.make_move(move)
+    record = {
+        'white': result.white,
+        'black': result.black,
+        'result': result.result,
+        'termination': result.termination,
+        'seed': result.seed,
+        'fen': result.fen,
+        'moves': result.moves,
+        'san': sans,
+        'latencies': [round(latency, 6) for latency in result.latencies],
+        'white_time': round(sum(result.color_latencies('white')), 6),
+        'black_time': round(sum(result.color_latencies('black')), 6),
+    }
+    record.update(extra)
+    return record
+
+def format_pgn(record: dict) -> str:
+    tags = [
+        ('Event', 'ai_chess_assignment match'),
+        ('Site', '?'),
+        ('Date', record.get('date', '????.??.??')),
+        ('Round', str(record.get('game', '?'))),
+        ('White', record['white']),
+        ('Black', record['black']),
+        ('Result', record['result']),
+        ('Termination', record['termination']),
+        ('Seed', '?' if record['seed'] is None else str(record['seed'])),
+        ('WhiteTime', f'{record["white_time"]:.3f}'),
+        ('BlackTime', f'{record["black_time"]:.3f}'),
+    ]
+    fields = ['w', '1']
+    if record.get('fen'):
+        tags += [('SetUp', '1'), ('FEN', record['fen'])]
+        fields = record['fen'].split()[1::4]
+    lines = [f'[{name} "{value}"]' for name, value in tags]
+    lines.append('')
+    # move numbers continue from the FEN's, and a game black starts opens
+    # with 'N...'
+    first = int(fields[1]) if len(fields) > 1 and fields[1].isdigit() else 1
+    offset = 1 if fields[0] == 'b' else 0
+    tokens = []
+    for i, move in enumerate(record['san']):
+        ply = i + offset
+        if ply % 2 == 0:
+            tokens.append(f'{first + ply // 2}.')
+        elif i == 0:
+            tokens.append(f'{first}...')
+        tokens.append(move)
+    tokens.append(record['result'])
+    line = ''
+    for token in tokens:
+        if len(line) + len(token) + 1 > 79:
+            lines.append(line)
+            line = token
+        else:
+            line = token if line == '' else line + ' ' + token
+    lines.append(line)
+    return '\n'.join(lines) + '\n\n'
+
+class GameRecordWriter:
+    """
+    Appends finished games to a PGN or JSONL file (chosen by extension
+    unless `format` is given) through a buffered file handle. Nothing is
+    kept per game, so memory stays flat however many games are written.
+    Use as a context manager or call close() to flush the buffer.
+    """
+    def __init__(self, path: str, format: Literal['pgn', 'jsonl'] = None,
+                 buffer_size: int = 1 << 16):
+        if format is None:
+            format = 'pgn' if path.lower().endswith('.pgn') else 'jsonl'
+        self.path = path
+        self.format = format
+        self.games = 0
+        self.file = open(path, 'a', buffering=buffer_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, result: MatchResult, **extra) -> dict:
+        record = game_record(result, date=datetime.date.today().strftime('%Y.%m.%d'), **extra)
+        if self.format == 'pgn':
+            self.file.write(format_pgn(record))
+        else:
+            self.file.write(json.dumps(record) + '\n')
+        self.games += 1
+        return record
+
+    def close(self):
+        self.file.close()
+
+def read_pgn(lines: Iterator[str]) -> Iterator[dict]:
+    tags: dict[str, str] = {}
+    movetext: list[str] = []
+    for line in lines:
+        line = line.strip()
+        match = _PGN_TAG.match(line)
+        if match is not None:
+            if movetext:
+                yield _pgn_record(tags, movetext)
+                tags, movetext = {}, []
+            tags[match.group(1)] = match.group(2)
+        elif line:
+            movetext.append(line)
+    if tags or movetext:
+        yield _pgn_record(tags, movetext)
+
+def _pgn_record(tags: dict[str, str], movetext: list[str]) -> dict:
+    text = re.sub(r'\{[^}]*\}|\([^)]*\)|\$\d+', ' ', ' '.join(movetext))
+    sans = [token for token in re.sub(r'\d+\.(\.\.)?', ' ', text).split()
+            if token not in _PGN_RESULTS]
+    seed = tags.get('Seed', '?')
+    return {
+        'white': tags.get('White', '?'),
+        'black': tags.get('Black', '?'),
+        'result': tags.get('Result', '*'),
+        'termination': tags.get('Termination', '?'),
+        'seed': int(seed) if seed.lstrip('-').isdigit() else None,
+        'game': tags.get('Round', '?'),
+        'fen': tags.get('FEN'),
+        'san': sans,
+    }
+
+def read_records(path: str) -> Iterator[dict]:
+    """
+    Stream the game records of a PGN or JSONL file one at a time.
+    """
+    with open(path) as f:
+        if path.lower().endswith('.pgn'):
+            yield from read_pgn(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def replay(record: dict, plies: int = None) -> Board:
+    """
+    Headless board with the record's moves (coordinate moves if present,
+    otherwise SAN) played from its starting FEN if it has one, stopping
+    after `plies` moves if given.
+    """
+    board = Board.from_fen(record['fen']) if record.get('fen') else Board()
+    moves = record.get('moves') or record['san']
+    for text in moves[:plies]:
+        board.make_move(parse_move(board, text))
+    return board
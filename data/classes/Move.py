@@ -0,0 +1,41 @@
+# /* Move.py
+
+from array import array
+
+# 16-bit move codes, used by the search and stored in the transposition
+# table and opening book:
+#   bits 0-5    from square index (y * 8 + x)
+#   bits 6-11   to square index
+#   bits 12-13  promotion piece (KNIGHT, BISHOP, ROOK, QUEEN as 0-3); this
+#               game always promotes to a queen
+#   bits 14-15  kind: NORMAL, PROMOTION or CASTLING (2, en passant, is
+#               unused as the game has none)
+# Captures are not flagged; the target square says whether a move is one.
+# 0 never encodes a legal move, so it stands for "no move".
+PROMOTION = 1 << 14
+CASTLING = 3 << 14
+KIND_MASK = 3 << 14
+QUEEN_PROMOTION = PROMOTION | (3 << 12)
+
+# Legal moves in a position never exceed 218
+MAX_MOVES = 256
+
+def from_square(code: int) -> int:
+    return code & 63
+
+def to_square(code: int) -> int:
+    return (code >> 6) & 63
+
+def move_index(code: int) -> int:
+    # From and to squares only, for tables indexed by move (history)
+    return code & 0xFFF
+
+def is_promotion(code: int) -> bool:
+    return code & KIND_MASK == PROMOTION
+
+def move_buffer() -> array:
+    """
+    Preallocated array('H') with room for the moves of any position, for
+    Board.generate_move_codes.
+    """
+    return array('H', bytes(2 * MAX_MOVES))
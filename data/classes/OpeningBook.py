@@ -0,0 +1,129 @@
+# /* OpeningBook.py
+
+import mmap
+import random
+import struct
+
+from typing import Iterable
+from data.classes.Board import Board
+from data.classes.Square import Square
+from data.classes.GameRecord import parse_move
+
+# File layout: a 16-byte header (magic, entry count) followed by 16-byte
+# entries sorted by key, then by weight (best first):
+#   key     uint64  Board.hash (Zobrist) of the position
+#   move    uint16  Board.encode_move of the book move
+#   weight  uint16  2 per game the mover won with it, 1 per draw
+#   games   uint32  number of games the move was played in
+# All fields are little-endian.
+MAGIC = b'ACBOOK01'
+HEADER = struct.Struct('<8sQ')
+ENTRY = struct.Struct('<QHHI')
+KEY = struct.Struct('<Q')
+
+class OpeningBook:
+    """
+    Read-only view of a book file through mmap: opening it reads only the
+    header, and each lookup is a binary search over the sorted entries,
+    touching O(log n) pages.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or len(self.data) != HEADER.size + self.size * ENTRY.size:
+            raise ValueError(f'{path} is not an opening book')
+
+    def __len__(self) -> int:
+        return self.size
+
+    def key_at(self, index: int) -> int:
+        return KEY.unpack_from(self.data, HEADER.size + index * ENTRY.size)[0]
+
+    def probe(self, key: int) -> list[tuple[int, int, int]]:
+        """
+        (move, weight, games) of every entry for a position hash.
+        """
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        output = []
+        while lo < self.size:
+            entry_key, move, weight, games = ENTRY.unpack_from(
+                self.data, HEADER.size + lo * ENTRY.size)
+            if entry_key != key:
+                break
+            output.append((move, weight, games))
+            lo += 1
+        return output
+
+    def choose(self, board: Board, weighted: bool = True) -> tuple[Square, Square] | None:
+        """
+        A legal book move for the side to move, or None when the position
+        is not in the book. Weighted picks at random in proportion to the
+        weights (through the random module, so seeded matches repeat);
+        otherwise the highest weight wins.
+        """
+        entries = self.probe(board.hash)
+        if len(entries) < 1:
+            return None
+        legal = board.get_all_valid_moves(board.turn)
+        moves = []
+        weights = []
+        for code, weight, _ in entries:
+            move = board.decode_move(code)
+            # guards against hash collisions
+            if weight > 0 and move in legal:
+                moves.append(move)
+                weights.append(weight)
+        if len(moves) < 1:
+            return None
+        if weighted:
+            return random.choices(moves, weights)[0]
+        return moves[0]
+
+    def close(self):
+        self.data.close()
+
+def build_book(records: Iterable[dict], path: str, max_plies: int = 20,
+               min_weight: int = 1) -> int:
+    """
+    Write a book from game records (as read by GameRecord.read_records
+    from PGN or JSONL files) covering each game's first max_plies moves.
+    Moves whose total weight is below min_weight are left out. Returns
+    the number of entries written. Games set up from a FEN are skipped,
+    and a game's line stops at the first move this game cannot play
+    (en passant or an under-promotion in a PGN from elsewhere).
+    """
+    totals: dict[tuple[int, int], list[int]] = {}
+    for record in records:
+        if record.get('fen'):
+            continue
+        winner = {'1-0': 'white', '0-1': 'black'}.get(record['result'])
+        board = Board()
+        for text in (record.get('moves') or record['san'])[:max_plies]:
+            try:
+                move = parse_move(board, text)
+            except ValueError:
+                break
+            total = totals.setdefault((board.hash, board.encode_move(move)), [0, 0])
+            if winner is None:
+                total[0] += 1
+            elif winner == board.turn:
+                total[0] += 2
+            total[1] += 1
+            board.make_move(move)
+    entries = sorted(((key, move, min(weight, 0xFFFF), min(games, 0xFFFFFFFF))
+                      for (key, move), (weight, games) in totals.items()
+                      if weight >= min_weight),
+                     key=lambda entry: (entry[0], -entry[2], entry[1]))
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(entries)))
+        for entry in entries:
+            f.write(ENTRY.pack(*entry))
+    return len(entries)
@@ -0,0 +1,65 @@
+# /* Perft.py
+
+import time
+
+from data.classes.Board import Board
+from data.classes.Square import Square
+
+# Standard perft positions (FEN) with node counts per depth. Counts marked
+# "standard" are the published values. This game has no en passant and
+# always promotes to a queen, so at depths where the published counts
+# include those moves the listed count is for this game's rules instead
+# (checked against an independent move generator restricted the same way).
+PERFT_SUITE: list[tuple[str, str, dict[int, int]]] = [
+    ('startpos', 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+     {1: 20, 2: 400, 3: 8902, 4: 197281}),                  # standard
+    ('kiwipete', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+     {1: 48, 2: 2038, 3: 97766}),                           # 1 standard
+    ('position3', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+     {1: 14, 2: 191, 3: 2810, 4: 43087}),                   # 1-2 standard
+    ('position4', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+     {1: 6, 2: 228, 3: 8083}),                              # 1 standard
+    ('position5', 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+     {1: 41, 2: 1373, 3: 54007}),
+    ('position6', 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+     {1: 46, 2: 2079, 3: 89890}),                           # standard
+]
+
+def move_name(move: tuple[Square, Square]) -> str:
+    return move[0].coord + move[1].coord
+
+def perft(board: Board, depth: int) -> int:
+    """
+    Number of leaf nodes of the legal move tree to the given depth.
+    """
+    if depth == 0:
+        return 1
+    moves = board.get_all_valid_moves(board.turn)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+def divide(board: Board, depth: int) -> dict[str, int]:
+    """
+    Perft split by root move, for finding which move a wrong count is under.
+    """
+    output: dict[str, int] = {}
+    for move in board.get_all_valid_moves(board.turn):
+        board.make_move(move)
+        output[move_name(move)] = perft(board, depth - 1)
+        board.unmake_move()
+    return output
+
+def timed_perft(board: Board, depth: int) -> tuple[int, float]:
+    """
+    Return (nodes, nodes per second).
+    """
+    start = time.perf_counter()
+    nodes = perft(board, depth)
+    elapsed = time.perf_counter() - start
+    return nodes, nodes / elapsed if elapsed > 0 else float('inf')
@@ -24,6 +24,8 @@ class Piece:
         assert(False)
 
     def get_moves(self, board: Board) -> list[Square]:
+        if board.bitboard is not None:
+            return board.get_bitboard_moves(self)
         output: list[Square] = []
         for direction in self.get_possible_moves(board):
             direction: list[Square]
@@ -40,6 +42,8 @@ class Piece:
         return output
 
     def get_valid_moves(self, board: Board) -> list[Square]:
+        if board.bitboard is not None:
+            return board.get_bitboard_valid_moves(self)
         output: list[Square] = []
         for square in self.get_moves(board):
             if not board.is_in_check(self.color, board_change=[self.pos, square.pos]):
@@ -52,29 +56,9 @@ class Piece:
         for i in board.squares:
             i.highlight = False
         if square in self.get_valid_moves(board) or force:
-            prev_square = board.get_square_from_pos(self.pos)
-            self.pos, self.x, self.y = square.pos, square.x, square.y
-            prev_square.occupying_piece = None
-            square.occupying_piece = self
+            # Board.make_move handles promotion, castling and the turn
+            board.make_move((board.get_square_from_pos(self.pos), square))
             board.selected_square = None
-            self.has_moved = True
-            # Pawn promotion
-            if self.notation == ' ':
-                if self.y == 0 or self.y == 7:
-                    from data.classes.pieces.Queen import Queen
-                    square.occupying_piece = Queen(
-                        (self.x, self.y),
-                        self.color,
-                        board
-                    )
-            # Move rook if king castles
-            if self.notation == 'K':
-                if prev_square.x - self.x == 2:
-                    rook = board.get_piece_from_pos((0, self.y))
-                    rook.move(board, board.get_square_from_pos((3, self.y)), force=True)
-                elif prev_square.x - self.x == -2:
-                    rook = board.get_piece_from_pos((7, self.y))
-                    rook.move(board, board.get_square_from_pos((5, self.y)), force=True)
             return True
         else:
             board.selected_square = None
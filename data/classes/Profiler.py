@@ -0,0 +1,192 @@
+# /* Profiler.py
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+
+# Subsystems that time is reported under, matched against the frames of
+# each stack sample as (file name, function name); '*' matches any
+# function in the file. A sample counts for the innermost frame with a
+# match, except that helper frames (WEAK_RULES) only count when no
+# enclosing frame matches: an attack-state lookup made by is_in_check is
+# check detection, while the same lookup made by move generation is not.
+SUBSYSTEM_RULES: list[tuple[str, str, str]] = [
+    ('rendering', 'Board.py', 'draw'),
+    ('rendering', 'Square.py', 'draw'),
+    ('rendering', 'Square.py', 'rect'),
+    ('rendering', 'Sprites.py', '*'),
+    ('deepcopy', 'copy.py', '*'),
+    ('deepcopy', 'Board.py', '__deepcopy__'),
+    ('get_square_from_pos', 'Board.py', 'get_square_from_pos'),
+    ('get_square_from_pos', 'Board.py', 'get_piece_from_pos'),
+    ('is_in_check', 'Board.py', 'is_in_check'),
+    ('is_in_check', 'Board.py', '_bitboard_in_check'),
+    ('is_in_check', 'Board.py', 'is_in_checkmate'),
+    ('evaluation', 'Board.py', 'evaluate'),
+    ('evaluation', 'Evaluation.py', '*'),
+    ('evaluation', 'BatchEvaluator.py', '*'),
+    ('evaluation', 'MinimaxPlayer.py', 'evaluate'),
+    ('evaluation', 'MinimaxPlayer.py', 'evaluate_board'),
+    ('move ordering', 'MinimaxPlayer.py', 'order_moves'),
+    ('move ordering', 'MinimaxPlayer.py', 'order_captures'),
+    ('move ordering', 'MinimaxPlayer.py', 'see'),
+    ('make/unmake', 'Board.py', 'make_move'),
+    ('make/unmake', 'Board.py', 'make_move_code'),
+    ('make/unmake', 'Board.py', 'make_square_move'),
+    ('make/unmake', 'Board.py', 'unmake_move'),
+    ('make/unmake', 'Board.py', 'handle_move'),
+    ('move generation', 'Board.py', 'get_all_valid_moves'),
+    ('move generation', 'Board.py', 'generate_move_codes'),
+    ('move generation', 'Board.py', 'get_all_valid_captures'),
+    ('move generation', 'Board.py', 'get_bitboard_moves'),
+    ('move generation', 'Board.py', 'get_bitboard_valid_moves'),
+    ('move generation', 'Piece.py', '*'),
+    ('move generation', 'Pawn.py', '*'),
+    ('move generation', 'Knight.py', '*'),
+    ('move generation', 'Bishop.py', '*'),
+    ('move generation', 'Rook.py', '*'),
+    ('move generation', 'Queen.py', '*'),
+    ('move generation', 'King.py', '*'),
+]
+WEAK_RULES: list[tuple[str, str, str]] = [
+    ('move generation', 'Bitboard.py', '*'),
+    ('move generation', 'Board.py', 'get_attack_state'),
+    ('make/unmake', 'Board.py', 'move_piece'),
+    ('make/unmake', 'Board.py', 'place_piece'),
+    ('make/unmake', 'Board.py', 'remove_piece'),
+]
+SUBSYSTEMS = ['move generation', 'is_in_check', 'get_square_from_pos', 'evaluation',
+              'move ordering', 'make/unmake', 'deepcopy', 'rendering', 'other']
+
+def _rule_table(rules: list[tuple[str, str, str]]) -> dict[tuple[str, str], str]:
+    return {(file_name, function): subsystem for subsystem, file_name, function in rules}
+
+class Profiler:
+    """
+    Runs cProfile on the calling thread and, alongside it, a sampling
+    thread that records the calling thread's stack every `interval`
+    seconds. The cProfile data is written as a pstats file; the samples
+    give the per-subsystem breakdown and a collapsed-stack file
+    ('frame;frame;frame count' lines) for flamegraph tools. Both are
+    slowed by cProfile's overhead, which weighs most on code that makes
+    many small Python calls.
+
+    with Profiler() as profiler:
+        run_match(...)
+    print(profiler.report())
+    """
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.profile = cProfile.Profile()
+        self.samples: dict[tuple[str, ...], int] = {}
+        self.subsystem_samples: dict[str, int] = {name: 0 for name in SUBSYSTEMS}
+        self.elapsed = 0.0
+        self._rules = _rule_table(SUBSYSTEM_RULES)
+        self._weak_rules = _rule_table(WEAK_RULES)
+        self._thread_id: int = None
+        self._running = False
+        self._sampler: threading.Thread = None
+        self._start = 0.0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        self._thread_id = threading.get_ident()
+        self._running = True
+        self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+        self._sampler.start()
+        self._start = time.perf_counter()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        self.elapsed += time.perf_counter() - self._start
+        self._running = False
+        self._sampler.join()
+
+    def _sample_loop(self):
+        while self._running:
+            time.sleep(self.interval)
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self._record(frame)
+
+    def _record(self, frame):
+        stack = []
+        subsystem = None
+        weak = None
+        while frame is not None:
+            code = frame.f_code
+            file_name = os.path.basename(code.co_filename)
+            stack.append(f'{file_name}:{code.co_qualname}')
+            key_any = (file_name, '*')
+            key = (file_name, code.co_name)
+            if subsystem is None:
+                subsystem = self._rules.get(key) or self._rules.get(key_any)
+                if weak is None:
+                    weak = self._weak_rules.get(key) or self._weak_rules.get(key_any)
+            if subsystem is None and 'pygame' in code.co_filename:
+                subsystem = 'rendering'
+            frame = frame.f_back
+        stack.reverse()
+        stack = tuple(stack)
+        self.samples[stack] = self.samples.get(stack, 0) + 1
+        self.subsystem_samples[subsystem or weak or 'other'] += 1
+
+    def subsystem_times(self) -> dict[str, float]:
+        """
+        Estimated seconds per subsystem: its share of the samples times
+        the profiled wall time.
+        """
+        total = sum(self.subsystem_samples.values())
+        if total < 1:
+            return {name: 0.0 for name in SUBSYSTEMS}
+        return {name: self.elapsed * count / total
+                for name, count in self.subsystem_samples.items()}
+
+    def write_stats(self, path: str):
+        self.profile.dump_stats(path)
+
+    def write_collapsed(self, path: str):
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(';'.join(stack) + f' {count}\n')
+
+    def report(self, top: int = 15) -> str:
+        total = max(sum(self.subsystem_samples.values()), 1)
+        lines = [f'{self.elapsed:.2f}s profiled, {total} samples',
+                 f'{"subsystem":<20} {"seconds":>8} {"share":>7}']
+        for name, seconds in sorted(self.subsystem_times().items(), key=lambda item: -item[1]):
+            lines.append(f'{name:<20} {seconds:>8.3f} '
+                         f'{100 * self.subsystem_samples[name] / total:>6.1f}%')
+        stats = pstats.Stats(self.profile)
+        rows = sorted(stats.stats.items(), key=lambda item: -item[1][2])[:top]
+        lines.append('')
+        lines.append(f'{"own time":>9} {"total":>9} {"calls":>10}  function')
+        for (file_name, line, function), (_, calls, own, cumulative, _) in rows:
+            lines.append(f'{own:>9.3f} {cumulative:>9.3f} {calls:>10}  '
+                         f'{os.path.basename(file_name)}:{line}({function})')
+        return '\n'.join(lines)
+
+def run_profiled(prefix: str, target, *args, **kwargs):
+    """
+    Call target(*args, **kwargs) under a Profiler, print the report and
+    write prefix.prof (cProfile stats, for pstats or snakeviz) and
+    prefix.folded (collapsed stacks, for flamegraph.pl or speedscope).
+    Returns the target's result.
+    """
+    with Profiler() as profiler:
+        output = target(*args, **kwargs)
+    print(profiler.report())
+    profiler.write_stats(prefix + '.prof')
+    profiler.write_collapsed(prefix + '.folded')
+    print(f'\nWrote {prefix}.prof and {prefix}.folded')
+    return output
@@ -0,0 +1,31 @@
+# /* Sprites.py
+
+from __future__ import annotations
+import pygame
+
+from typing import Literal, TYPE_CHECKING
+if TYPE_CHECKING:
+    from data.classes.Board import Board
+
+# Process-wide sprite cache shared by every board and every promotion.
+# Keyed by (piece, color, tile size) so each image is read from disk and
+# scaled at most once per tile size.
+_sprites: dict[tuple[str, str, tuple[int, int]], pygame.surface.Surface] = {}
+
+def get_sprite(name: str, color: Literal['white', 'black'], board: Board,
+               padding: int = 20) -> pygame.surface.Surface | None:
+    # Headless boards (display is None) never touch the filesystem or SDL
+    if board.display is None:
+        return None
+    key = (name, color, (board.tile_width, board.tile_height))
+    img = _sprites.get(key)
+    if img is None:
+        img = pygame.image.load('data/imgs/' + color + '_' + name + '.png')
+        img = pygame.transform.scale(
+            img, (board.tile_width - padding, board.tile_height - padding)
+        )
+        _sprites[key] = img
+    return img
+
+def clear_sprites() -> None:
+    _sprites.clear()
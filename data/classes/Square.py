@@ -24,17 +24,25 @@ class Square:
         self.occupying_piece: Piece = None
         self.coord = self.get_coord()
         self.highlight = False
-        self.rect = pygame.Rect(
-            self.abs_x,
-            self.abs_y,
-            self.width,
-            self.height
-        )
+        self._rect: pygame.Rect = None
 
-    # get the formal notation of the tile
+    # built on first draw so headless boards never create pygame objects
+    @property
+    def rect(self) -> pygame.Rect:
+        if self._rect is None:
+            self._rect = pygame.Rect(
+                self.abs_x,
+                self.abs_y,
+                self.width,
+                self.height
+            )
+        return self._rect
+
+    # get the formal notation of the tile (white starts on y = 6 and 7,
+    # so y = 7 is rank 1)
     def get_coord(self) -> str:
         columns = 'abcdefgh'
-        return columns[self.x] + str(self.y + 1)
+        return columns[self.x] + str(8 - self.y)
 
     def draw(self, display: pygame.surface.Surface) -> None:
         # configures if tile should be light or dark or highlighted tile
@@ -0,0 +1,480 @@
+# /* Tablebase.py
+
+from __future__ import annotations
+import os
+import time
+import numpy as np
+
+from typing import TYPE_CHECKING
+from data.classes.Bitboard import (
+    WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, COLORS, PIECE_TYPES,
+    RAYS, BETWEEN, KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, bit_squares
+)
+if TYPE_CHECKING:
+    from data.classes.Board import Board
+
+# Endgame tables for up to four pieces, built by retrograde analysis.
+#
+# A table covers one material set, named like 'KQKR': the white pieces,
+# then the black ones. Only one colour orientation is stored; a position
+# where black has the stronger set is probed with colours swapped and the
+# board flipped. Each table file is an int16 array of shape (2, N), row 0
+# for white to move and row 1 for black, holding for the side to move:
+#   v > 0   a win, mating in v plies
+#   v < 0   a loss, mated in -v - 1 plies (-1: checkmated now)
+#   v == 0  a draw (or an impossible position)
+# so the sign is the win/draw/loss result and the magnitude the distance
+# to mate. Castling is not possible in these positions and this game has
+# no en passant; pawns always promote to a queen.
+#
+# Positions are indexed by piece squares, white king first, then the black
+# king and the other pieces in table order. Board symmetry shrinks the
+# index: the white king is mapped into the 10-square triangle x <= 3,
+# y <= x (into the left half, x <= 3, when there are pawns, which only
+# allow a left-right mirror).
+
+LETTERS = 'PNBRQK'
+MAX_PIECES = 4
+# Built by default: every table with one piece besides the kings
+THREE_PIECE_TABLES = ['KQK', 'KRK', 'KBK', 'KNK', 'KPK']
+
+def _transform(flip_x: bool, flip_y: bool, transpose: bool) -> list[int]:
+    output = []
+    for sq in range(64):
+        x, y = sq % 8, sq // 8
+        if transpose:
+            x, y = y, x
+        if flip_x:
+            x = 7 - x
+        if flip_y:
+            y = 7 - y
+        output.append(y * 8 + x)
+    return output
+
+# Symmetries in a fixed order; pawn tables may only use the first two
+TRANSFORMS = [_transform(flip_x, flip_y, transpose) for transpose in (False, True)
+              for flip_y in (False, True) for flip_x in (False, True)]
+TRANSFORMS_NP = np.array(TRANSFORMS, dtype=np.int64)
+
+def _king_squares(pawns: bool) -> list[int]:
+    if pawns:
+        return [sq for sq in range(64) if sq % 8 <= 3]
+    return [sq for sq in range(64) if sq % 8 <= 3 and sq // 8 <= sq % 8]
+
+def _canonical_transforms(pawns: bool) -> list[int]:
+    # First symmetry that takes each white king square into the index set
+    squares = set(_king_squares(pawns))
+    count = 2 if pawns else 8
+    return [next(t for t in range(count) if TRANSFORMS[t][sq] in squares) for sq in range(64)]
+
+KING_SQUARES = {pawns: _king_squares(pawns) for pawns in (False, True)}
+KING_INDEX = {pawns: [KING_SQUARES[pawns].index(sq) if sq in KING_SQUARES[pawns] else -1
+                      for sq in range(64)] for pawns in (False, True)}
+CANONICAL = {pawns: _canonical_transforms(pawns) for pawns in (False, True)}
+KING_SQUARES_NP = {pawns: np.array(KING_SQUARES[pawns], dtype=np.int64) for pawns in (False, True)}
+KING_INDEX_NP = {pawns: np.array(KING_INDEX[pawns], dtype=np.int64) for pawns in (False, True)}
+CANONICAL_NP = {pawns: np.array(CANONICAL[pawns], dtype=np.int64) for pawns in (False, True)}
+
+def _matrix(table: list[int]) -> np.ndarray:
+    matrix = np.zeros((64, 64), dtype=bool)
+    for sq in range(64):
+        matrix[sq, bit_squares(table[sq])] = True
+    return matrix
+
+# [from, to] reach of each piece type on an empty board
+STEP_MATRIX = {KNIGHT: _matrix(KNIGHT_ATTACKS), KING: _matrix(KING_ATTACKS)}
+LINE_MATRIX = {
+    ROOK: _matrix([RAYS[0][sq] | RAYS[1][sq] | RAYS[4][sq] | RAYS[5][sq] for sq in range(64)]),
+    BISHOP: _matrix([RAYS[2][sq] | RAYS[3][sq] | RAYS[6][sq] | RAYS[7][sq] for sq in range(64)]),
+}
+LINE_MATRIX[QUEEN] = LINE_MATRIX[ROOK] | LINE_MATRIX[BISHOP]
+PAWN_MATRIX = [_matrix(PAWN_ATTACKS[WHITE]), _matrix(PAWN_ATTACKS[BLACK])]
+BETWEEN_NP = np.array(BETWEEN, dtype=np.uint64)
+BITS_NP = np.array([1 << sq for sq in range(64)], dtype=np.uint64)
+
+def material_name(white: list[int], black: list[int]) -> str:
+    """
+    Table name of the given non-king piece types, in table orientation.
+    """
+    white, black = sorted(white, reverse=True), sorted(black, reverse=True)
+    if black > white:
+        white, black = black, white
+    return 'K' + ''.join(LETTERS[p] for p in white) + 'K' + ''.join(LETTERS[p] for p in black)
+
+def parse_material(name: str) -> tuple[list[int], list[int]]:
+    """
+    Non-king piece types of each side of a table name such as 'KQKR'.
+    """
+    name = name.upper()
+    if name.count('K') != 2 or not name.startswith('K') \
+       or any(char not in LETTERS for char in name):
+        raise ValueError(f'Bad material {name}')
+    split = name.index('K', 1)
+    white = [LETTERS.index(char) for char in name[1:split]]
+    black = [LETTERS.index(char) for char in name[split + 1:]]
+    if len(white) + len(black) + 2 > MAX_PIECES:
+        raise ValueError(f'{name} has more than {MAX_PIECES} pieces')
+    return sorted(white, reverse=True), sorted(black, reverse=True)
+
+class Material:
+    """
+    Piece layout and index size of one table.
+    """
+    def __init__(self, name: str):
+        white, black = parse_material(name)
+        self.name = material_name(white, black)
+        # (color, piece type) of each index slot
+        self.pieces: list[tuple[int, int]] = [(WHITE, KING), (BLACK, KING)] \
+            + [(WHITE, p) for p in white] + [(BLACK, p) for p in black]
+        self.n = len(self.pieces)
+        self.pawns = PAWN in white or PAWN in black
+        self.size = len(KING_SQUARES[self.pawns]) * 64 ** (self.n - 1)
+
+    def dependencies(self) -> list[str]:
+        """
+        Tables reached by a capture or a promotion (without the bare kings).
+        """
+        output = []
+        for slot in range(2, self.n):
+            rest = [self.pieces[i] for i in range(2, self.n) if i != slot]
+            output.append(material_name([p for c, p in rest if c == WHITE],
+                                        [p for c, p in rest if c == BLACK]))
+            color, ptype = self.pieces[slot]
+            if ptype == PAWN:
+                promoted = rest + [(color, QUEEN)]
+                output.append(material_name([p for c, p in promoted if c == WHITE],
+                                            [p for c, p in promoted if c == BLACK]))
+        return [name for name in dict.fromkeys(output) if name != 'KK']
+
+def locate(pieces: list[tuple[int, int, object]], turn: int) -> tuple[str, int, object]:
+    """
+    (table name, side to move, index) of a position given as
+    (color, piece type, square) triples. Squares may be ints or numpy
+    arrays of squares (one entry per position).
+    """
+    white = [p for c, p, _ in pieces if c == WHITE and p != KING]
+    black = [p for c, p, _ in pieces if c == BLACK and p != KING]
+    name = material_name(white, black)
+    if sorted(black, reverse=True) > sorted(white, reverse=True):
+        pieces = [(c ^ 1, p, sq ^ 56) for c, p, sq in pieces]
+        turn ^= 1
+    if name == 'KK':
+        return name, turn, None
+    pawns = any(p == PAWN for _, p, _ in pieces)
+    # Squares in table slot order: kings, then pieces by colour and type
+    ordered = sorted(pieces, key=lambda piece: (piece[1] != KING, piece[0], -piece[1]))
+    scalar = isinstance(ordered[0][2], (int, np.integer))
+    if scalar:
+        transform = TRANSFORMS[CANONICAL[pawns][ordered[0][2]]]
+        squares = [transform[sq] for _, _, sq in ordered]
+        index = KING_INDEX[pawns][squares[0]]
+    else:
+        transform = CANONICAL_NP[pawns][ordered[0][2]]
+        squares = [TRANSFORMS_NP[transform, sq] for _, _, sq in ordered]
+        index = KING_INDEX_NP[pawns][squares[0]]
+    for sq in squares[1:]:
+        index = index * 64 + sq
+    return name, turn, index
+
+def _attacked(ksq: np.ndarray, attackers: list[tuple[int, int, np.ndarray, np.ndarray]],
+              occupied: np.ndarray) -> np.ndarray:
+    # attackers: (color, piece type, squares, present) for each enemy piece
+    output = np.zeros(len(ksq), dtype=bool)
+    for color, ptype, sq, present in attackers:
+        if ptype == PAWN:
+            hit = PAWN_MATRIX[color][sq, ksq]
+        elif ptype in STEP_MATRIX:
+            hit = STEP_MATRIX[ptype][sq, ksq]
+        else:
+            hit = LINE_MATRIX[ptype][sq, ksq] & ((BETWEEN_NP[sq, ksq] & occupied) == 0)
+        output |= hit & present
+    return output
+
+class _Builder:
+    """
+    Retrograde solver for one table. Moves into the same table become
+    edges between positions; captures and promotions are looked up in the
+    (already solved) smaller tables straight away.
+    """
+    def __init__(self, material: Material, tables: dict[str, np.ndarray]):
+        self.material = material
+        self.tables = tables
+        n, size = material.n, material.size
+        index = np.arange(size, dtype=np.int64)
+        self.squares = [KING_SQUARES_NP[material.pawns][index // 64 ** (n - 1)]]
+        for slot in range(1, n):
+            self.squares.append((index // 64 ** (n - 1 - slot)) % 64)
+        self.occupied = np.zeros(size, dtype=np.uint64)
+        for sq in self.squares:
+            self.occupied |= BITS_NP[sq]
+        distinct = np.ones(size, dtype=bool)
+        for i in range(n):
+            for j in range(i + 1, n):
+                distinct &= self.squares[i] != self.squares[j]
+            if material.pieces[i][1] == PAWN:
+                distinct &= (self.squares[i] // 8 != 0) & (self.squares[i] // 8 != 7)
+        self.in_check = [self._king_attacked(color) for color in (WHITE, BLACK)]
+        # valid[turn]: the side not to move is not in check
+        self.valid = [distinct & ~self.in_check[BLACK], distinct & ~self.in_check[WHITE]]
+        self.moves = [np.zeros(size, dtype=np.int32) for _ in range(2)]
+        self.edges: list[list[tuple[np.ndarray, np.ndarray]]] = [[], []]
+        big = np.iinfo(np.int32).max
+        # Best win and longest loss through captures/promotions, and
+        # whether one of them reaches a draw
+        self.ext_win = [np.full(size, big, dtype=np.int32) for _ in range(2)]
+        self.ext_loss = [np.zeros(size, dtype=np.int32) for _ in range(2)]
+        self.ext_draw = [np.zeros(size, dtype=bool) for _ in range(2)]
+
+    def _king_attacked(self, color: int) -> np.ndarray:
+        present = np.ones(self.material.size, dtype=bool)
+        attackers = [(c, ptype, self.squares[slot], present)
+                     for slot, (c, ptype) in enumerate(self.material.pieces) if c != color]
+        return _attacked(self.squares[0 if color == WHITE else 1], attackers, self.occupied)
+
+    def generate_moves(self):
+        for turn in (WHITE, BLACK):
+            for slot, (color, ptype) in enumerate(self.material.pieces):
+                if color != turn:
+                    continue
+                if ptype == PAWN:
+                    self._pawn_pushes(turn, slot)
+                for target in range(64):
+                    self._moves_to(turn, slot, ptype, target)
+
+    def _moves_to(self, turn: int, slot: int, ptype: int, target: int):
+        sq = self.squares[slot]
+        if ptype == PAWN:
+            reach = PAWN_MATRIX[turn][sq, target]
+        elif ptype in STEP_MATRIX:
+            reach = STEP_MATRIX[ptype][sq, target]
+        else:
+            reach = LINE_MATRIX[ptype][sq, target]
+        positions = np.nonzero(reach & self.valid[turn])[0]
+        if ptype not in STEP_MATRIX and ptype != PAWN:
+            clear = (BETWEEN_NP[sq[positions], target] & self.occupied[positions]) == 0
+            positions = positions[clear]
+        squares = [s[positions] for s in self.squares]
+        captured = np.full(len(positions), -1, dtype=np.int64)
+        blocked = np.zeros(len(positions), dtype=bool)
+        for other, (color, other_type) in enumerate(self.material.pieces):
+            if other == slot:
+                continue
+            here = squares[other] == target
+            if color == turn or other_type == KING:
+                blocked |= here
+            else:
+                captured[here] = other
+        keep = ~blocked
+        if ptype == PAWN:
+            # pawns only move diagonally to capture
+            keep &= captured >= 0
+        positions, captured = positions[keep], captured[keep]
+        squares = [s[keep] for s in squares]
+        squares[slot] = np.full(len(positions), target, dtype=np.int64)
+        self._emit(turn, slot, positions, squares, captured)
+
+    def _pawn_pushes(self, turn: int, slot: int):
+        step = -8 if turn == WHITE else 8
+        start_rank = 6 if turn == WHITE else 1
+        for double in (False, True):
+            positions = np.nonzero(self.valid[turn])[0]
+            sq = self.squares[slot][positions]
+            if double:
+                keep = sq // 8 == start_rank
+                positions, sq = positions[keep], sq[keep]
+            occupied = self.occupied[positions]
+            keep = (occupied & BITS_NP[sq + step]) == 0
+            if double:
+                keep &= (occupied & BITS_NP[sq + 2 * step]) == 0
+            positions = positions[keep]
+            squares = [s[positions] for s in self.squares]
+            squares[slot] = squares[slot] + (2 * step if double else step)
+            self._emit(turn, slot, positions, squares, np.full(len(positions), -1, dtype=np.int64))
+
+    def _emit(self, turn: int, slot: int, positions: np.ndarray, squares: list[np.ndarray],
+              captured: np.ndarray):
+        """
+        Record the legal moves among these candidate moves: squares are the
+        piece squares after the move, captured the slot taken (or -1).
+        """
+        if len(positions) < 1:
+            return
+        pieces = self.material.pieces
+        occupied = np.zeros(len(positions), dtype=np.uint64)
+        for sq in squares:
+            occupied |= BITS_NP[sq]
+        ksq = squares[0 if turn == WHITE else 1]
+        attackers = [(color, ptype, squares[other], captured != other)
+                     for other, (color, ptype) in enumerate(pieces) if color != turn]
+        legal = ~_attacked(ksq, attackers, occupied)
+        positions, captured = positions[legal], captured[legal]
+        squares = [sq[legal] for sq in squares]
+        self.moves[turn][positions] += 1
+        promoting = np.zeros(len(positions), dtype=bool)
+        if pieces[slot][1] == PAWN:
+            promoting = squares[slot] // 8 == (0 if turn == WHITE else 7)
+        for taken in set(captured.tolist()):
+            for promotion in (False, True):
+                select = (captured == taken) & (promoting == promotion)
+                if not select.any():
+                    continue
+                rest = [(color, QUEEN if i == slot and promotion else ptype, sq[select])
+                        for i, ((color, ptype), sq) in enumerate(zip(pieces, squares))
+                        if i != taken]
+                name, after, index = locate(rest, turn ^ 1)
+                if taken < 0 and not promotion:
+                    self.edges[turn].append((positions[select].astype(np.int32),
+                                             index.astype(np.int32)))
+                else:
+                    self._external(turn, positions[select], name, after, index)
+
+    def _external(self, turn: int, positions: np.ndarray, name: str, after: int,
+                  index: np.ndarray):
+        # Result for the opponent, who moves next in the smaller table
+        if name == 'KK':
+            values = np.zeros(len(positions), dtype=np.int32)
+        else:
+            values = np.asarray(self.tables[name][after][index], dtype=np.int32)
+        lost = values < 0
+        self.ext_win[turn][positions[lost]] = np.minimum(
+            self.ext_win[turn][positions[lost]], -values[lost])
+        won = values > 0
+        self.ext_loss[turn][positions[won]] = np.maximum(
+            self.ext_loss[turn][positions[won]], values[won] + 1)
+        self.ext_draw[turn][positions[values == 0]] = True
+
+    def solve(self) -> np.ndarray:
+        """
+        Distance-to-mate values, assigned level by level: at level k a
+        position wins if some move reaches a position lost at level k - 1
+        (or a smaller table's loss in k - 1), and loses once every move
+        reaches a win and the longest of them has length k - 1.
+        """
+        size = self.material.size
+        big = np.iinfo(np.int32).max
+        edges = []
+        remaining = []
+        for turn in (WHITE, BLACK):
+            if self.edges[turn]:
+                src = np.concatenate([src for src, _ in self.edges[turn]])
+                dst = np.concatenate([dst for _, dst in self.edges[turn]])
+            else:
+                src = dst = np.zeros(0, dtype=np.int32)
+            self.edges[turn] = []
+            edges.append((src, dst))
+            remaining.append(np.bincount(src, minlength=size).astype(np.int32))
+        values = np.zeros((2, size), dtype=np.int16)
+        resolved = [~self.valid[turn] for turn in (WHITE, BLACK)]
+        lost = []
+        won = []
+        for turn in (WHITE, BLACK):
+            stuck = self.valid[turn] & (self.moves[turn] == 0)
+            mated = stuck & self.in_check[turn]
+            values[turn][mated] = -1
+            resolved[turn] |= stuck
+            lost.append(mated)
+            won.append(np.zeros(size, dtype=bool))
+        last = max(int(np.where(self.ext_win[turn] < big, self.ext_win[turn], 0).max(initial=0))
+                   for turn in (WHITE, BLACK))
+        last = max(last, max(int(self.ext_loss[turn].max(initial=0)) for turn in (WHITE, BLACK)))
+        level = 1
+        while True:
+            next_lost = []
+            next_won = []
+            for turn in (WHITE, BLACK):
+                src, dst = edges[turn]
+                other = turn ^ 1
+                win = self.ext_win[turn] == level
+                win[src[lost[other][dst]]] = True
+                win &= ~resolved[turn]
+                if won[other].any():
+                    remaining[turn] -= np.bincount(src[won[other][dst]],
+                                                   minlength=size).astype(np.int32)
+                loss = ~resolved[turn] & ~win & (remaining[turn] == 0) \
+                    & ~self.ext_draw[turn] & (self.ext_win[turn] == big) \
+                    & (self.ext_loss[turn] <= level)
+                values[turn][win] = level
+                values[turn][loss] = -(level + 1)
+                resolved[turn] |= win | loss
+                next_won.append(win)
+                next_lost.append(loss)
+            lost, won = next_lost, next_won
+            if level > last and not any(mask.any() for mask in lost + won):
+                return values
+            level += 1
+
+def generate(name: str, directory: str, tables: dict[str, np.ndarray] = None,
+             log=print) -> np.ndarray:
+    """
+    Build (or load, if its file exists) the table for a material set,
+    building the tables it depends on first, and return it memory-mapped.
+    """
+    tables = {} if tables is None else tables
+    material = Material(name)
+    if material.name in tables:
+        return tables[material.name]
+    path = os.path.join(directory, material.name + '.npy')
+    if not os.path.exists(path):
+        for dependency in material.dependencies():
+            generate(dependency, directory, tables, log)
+        start = time.perf_counter()
+        builder = _Builder(material, tables)
+        builder.generate_moves()
+        values = builder.solve()
+        os.makedirs(directory, exist_ok=True)
+        np.save(path, values)
+        if log is not None:
+            log(f'{material.name}: {material.size} positions, longest mate '
+                f'{int(values.max())} plies, built in {time.perf_counter() - start:.1f}s')
+    tables[material.name] = np.load(path, mmap_mode='r')
+    return tables[material.name]
+
+class Tablebases:
+    """
+    Probes the tables found in a directory. Files are memory-mapped the
+    first time a position with their material is probed.
+    """
+    def __init__(self, directory: str = 'tablebases'):
+        self.directory = directory
+        self.tables: dict[str, np.ndarray | None] = {}
+        self.max_pieces = 2
+        if os.path.isdir(directory):
+            for file_name in os.listdir(directory):
+                if file_name.endswith('.npy'):
+                    self.max_pieces = max(self.max_pieces, len(file_name) - 4)
+
+    def table(self, name: str) -> np.ndarray | None:
+        if name not in self.tables:
+            path = os.path.join(self.directory, name + '.npy')
+            self.tables[name] = np.load(path, mmap_mode='r') if os.path.exists(path) else None
+        return self.tables[name]
+
+    def probe(self, board: Board) -> int | None:
+        """
+        Table value of the position for the side to move (see the format
+        above), or None when it is not covered.
+        """
+        if board.castling:
+            return None
+        pieces = []
+        if board.bitboard is not None:
+            if board.bitboard.occupied.bit_count() > self.max_pieces:
+                return None
+            for color in (WHITE, BLACK):
+                for ptype in range(6):
+                    for sq in bit_squares(board.bitboard.pieces[color][ptype]):
+                        pieces.append((color, ptype, sq))
+        else:
+            for i, square in enumerate(board.squares):
+                piece = square.occupying_piece
+                if piece is not None:
+                    pieces.append((COLORS[piece.color], PIECE_TYPES[piece.notation], i))
+                    if len(pieces) > self.max_pieces:
+                        return None
+        name, turn, index = locate(pieces, COLORS[board.turn])
+        if name == 'KK':
+            return 0
+        table = self.table(name)
+        if table is None:
+            return None
+        return int(table[turn, index])
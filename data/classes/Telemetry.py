@@ -0,0 +1,67 @@
+# /* Telemetry.py
+
+# Verbosity levels for agents and the match runner. QUIET does no I/O.
+# MOVES prints one line per move for an agent, or the outcome of each game
+# for run_match; ITERATIONS adds one line per search iteration
+# (MinimaxPlayer) or per move played (run_match).
+QUIET = 0
+MOVES = 1
+ITERATIONS = 2
+
+# SearchStats kept in an agent's move_stats: the most recent moves only,
+# so a long tournament or UCI session does not grow it without bound
+MOVE_STATS_LIMIT = 1000
+
+class SearchStats:
+    """
+    Counters for one choose_action call. Agents fill it in while they
+    search; reading it costs nothing and printing is left to the caller
+    or to the agent's verbosity level.
+    """
+    __slots__ = ('nodes', 'leaf_evals', 'move_generations', 'check_tests',
+                 'cutoffs', 'tt_cutoffs', 'tb_hits', 'depth', 'score', 'time', 'book',
+                 'playouts', 'ponder_hit')
+
+    def __init__(self):
+        self.nodes = 0
+        # Static evaluations taken (quiescence stand-pat and horizon scores)
+        self.leaf_evals = 0
+        # Legal move and capture lists generated
+        self.move_generations = 0
+        self.check_tests = 0
+        # Beta cutoffs in the move loops, and nodes cut by a table entry
+        self.cutoffs = 0
+        self.tt_cutoffs = 0
+        # Positions scored by an endgame table
+        self.tb_hits = 0
+        self.depth = 0
+        self.score = 0
+        # Seconds spent in the call
+        self.time = 0.0
+        # The move came from the opening book without a search
+        self.book = False
+        # Random playouts run (MCTSPlayer)
+        self.playouts = 0
+        # The position was searched while the opponent was thinking
+        self.ponder_hit = False
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.time if self.time > 0 else 0.0
+
+    @property
+    def playouts_per_second(self) -> float:
+        return self.playouts / self.time if self.time > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        output = {name: getattr(self, name) for name in self.__slots__}
+        output['nps'] = self.nps
+        output['playouts_per_second'] = self.playouts_per_second
+        return output
+
+    def __repr__(self) -> str:
+        return (f'depth {self.depth} score {self.score} nodes {self.nodes} '
+                f'nps {self.nps:.0f} time {self.time * 1000:.0f}ms '
+                f'evals {self.leaf_evals} movegens {self.move_generations} '
+                f'checks {self.check_tests} cutoffs {self.cutoffs} '
+                f'tt_cutoffs {self.tt_cutoffs} tb_hits {self.tb_hits}')
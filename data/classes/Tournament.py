@@ -0,0 +1,180 @@
+# /* Tournament.py
+
+import ast
+import importlib
+import multiprocessing
+import os
+import pkgutil
+
+from typing import Iterator, Literal
+from data.classes.ChessMatch import MatchResult, run_match
+from data.classes.agents.ChessAgent import ChessAgent
+import data.classes.agents
+
+# Agents that need a window and a person at the mouse
+INTERACTIVE_AGENTS = {'HumanPlayer'}
+
+def agent_classes() -> dict[str, type]:
+    """
+    Every ChessAgent subclass defined in data/classes/agents, by class name.
+    """
+    for module in pkgutil.iter_modules(data.classes.agents.__path__):
+        importlib.import_module('data.classes.agents.' + module.name)
+    classes: dict[str, type] = {}
+    pending = list(ChessAgent.__subclasses__())
+    while len(pending) > 0:
+        cls = pending.pop()
+        classes[cls.__name__] = cls
+        pending.extend(cls.__subclasses__())
+    return classes
+
+def make_agent(spec: str, color: Literal['white', 'black']) -> ChessAgent:
+    """
+    Build an agent from a spec such as 'RandomPlayer' or
+    'MinimaxPlayer:time_limit=None,node_limit=20000'. Keyword values are
+    Python literals passed to the agent's constructor.
+    """
+    name, _, options = spec.partition(':')
+    classes = agent_classes()
+    if name not in classes:
+        raise ValueError(f'Agent {name} not found!')
+    kwargs = {}
+    for option in options.split(',') if options else []:
+        key, _, value = option.partition('=')
+        kwargs[key.strip()] = ast.literal_eval(value.strip())
+    try:
+        return classes[name](color, **kwargs)
+    except TypeError as error:
+        raise ValueError(f'Bad options for {name}: {error}')
+
+def play_game(task: tuple[int, str, str, int, int]) -> tuple[int, MatchResult]:
+    """
+    Worker entry point: (game index, white spec, black spec, seed, max
+    moves) to (game index, result). Agents are built fresh for every game
+    so no state carries over between games in the same process.
+    """
+    index, white, black, seed, max_moves = task
+    result = run_match(make_agent(white, 'white'), make_agent(black, 'black'),
+                       seed=seed, max_moves=max_moves)
+    result.white, result.black = white, black
+    return index, result
+
+def schedule(agents: list[str], games: int, seed: int = 0,
+             max_moves: int = 1000) -> list[tuple[int, str, str, int, int]]:
+    """
+    Games for a round robin: every ordered pair of distinct agents plays
+    `games` games, so each pairing is played with both colours. Two agents
+    give a plain match with colours alternating. Game i gets seed + i.
+    """
+    pairings = [(white, black) for i, white in enumerate(agents)
+                for j, black in enumerate(agents) if i != j]
+    if len(agents) == 1:
+        pairings = [(agents[0], agents[0])]
+    tasks = []
+    for _ in range(games):
+        for white, black in pairings:
+            index = len(tasks)
+            tasks.append((index, white, black, seed + index, max_moves))
+    return tasks
+
+def iter_tournament(agents: list[str], games: int, seed: int = 0,
+                    max_moves: int = 1000, workers: int = None) \
+                    -> Iterator[tuple[int, MatchResult]]:
+    """
+    Plays the schedule on a process pool (one worker per core by default)
+    and yields (game index, result) as games finish, so callers can
+    record and tally games without holding on to them.
+    """
+    for spec in agents:
+        if spec.partition(':')[0] in INTERACTIVE_AGENTS:
+            raise ValueError(f'{spec} cannot play headless games')
+        make_agent(spec, 'white')
+    tasks = schedule(agents, games, seed, max_moves)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for task in tasks:
+            yield play_game(task)
+        return
+    with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+        yield from pool.imap_unordered(play_game, tasks)
+
+def run_tournament(agents: list[str], games: int, seed: int = 0,
+                   max_moves: int = 1000, workers: int = None) -> list[MatchResult]:
+    """
+    All results of iter_tournament in schedule order. Each game depends
+    only on its own seed, so the results do not depend on the number of
+    workers or the order the games finish in, as long as the agents
+    themselves are deterministic (MinimaxPlayer only with a node or depth
+    budget and time_limit=None).
+    """
+    tasks = schedule(agents, games, seed, max_moves)
+    results: list[MatchResult] = [None] * len(tasks)
+    for index, result in iter_tournament(agents, games, seed, max_moves, workers):
+        results[index] = result
+    return results
+
+class Standings:
+    """
+    Running per-agent totals: games, wins, draws, losses, score (win 1,
+    draw 1/2), game length and mean time per move, plus a count of each
+    termination reason.
+    """
+    def __init__(self):
+        self.games = 0
+        self.totals: dict[str, dict] = {}
+        self.terminations: dict[str, int] = {}
+
+    def add(self, result: MatchResult):
+        self.games += 1
+        for color, name in (('white', result.white), ('black', result.black)):
+            row = self.totals.setdefault(name, {'agent': name, 'games': 0, 'wins': 0,
+                                                'draws': 0, 'losses': 0, 'moves': 0,
+                                                'latency': 0.0})
+            row['games'] += 1
+            row['moves'] += len(result.moves)
+            row['latency'] += result.mean_latency(color)
+            if result.winner is None:
+                row['draws'] += 1
+            elif result.winner == color:
+                row['wins'] += 1
+            else:
+                row['losses'] += 1
+        self.terminations[result.termination] = self.terminations.get(result.termination, 0) + 1
+
+    def rows(self) -> list[dict]:
+        """
+        One row per agent, best score first, with averages per game.
+        """
+        rows = []
+        for total in self.totals.values():
+            row = dict(total)
+            row['score'] = row['wins'] + row['draws'] / 2
+            row['moves'] /= row['games']
+            row['latency'] /= row['games']
+            rows.append(row)
+        return sorted(rows, key=lambda row: -row['score'] / row['games'])
+
+    def format(self) -> str:
+        rows = self.rows()
+        width = max([len('agent')] + [len(row['agent']) for row in rows])
+        lines = [f'{"agent":<{width}}  games   wins  draws losses   score      %  moves  ms/move']
+        for row in rows:
+            lines.append(f'{row["agent"]:<{width}}  {row["games"]:>5}  {row["wins"]:>5}  '
+                         f'{row["draws"]:>5}  {row["losses"]:>5}  {row["score"]:>6.1f}  '
+                         f'{100 * row["score"] / row["games"]:>5.1f}  {row["moves"]:>5.0f}  '
+                         f'{row["latency"] * 1000:>7.2f}')
+        lines.append('terminations: ' + ', '.join(f'{name} {count}' for name, count
+                                                  in sorted(self.terminations.items())))
+        return '\n'.join(lines)
+
+def summarize(results: list[MatchResult]) -> list[dict]:
+    standings = Standings()
+    for result in results:
+        standings.add(result)
+    return standings.rows()
+
+def format_summary(results: list[MatchResult]) -> str:
+    standings = Standings()
+    for result in results:
+        standings.add(result)
+    return standings.format()
@@ -0,0 +1,117 @@
+# /* TranspositionTable.py
+
+from array import array
+from multiprocessing import shared_memory
+
+# Bound types
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Each entry is two 64-bit words: the data word packs
+#   score (32 bits, signed) | move (16) | depth (8) | generation (6) | bound (2)
+# and the key word stores position hash XOR data, so a slot whose two words
+# were written by different stores never matches a probe. That makes the
+# table safe to share between processes without locks: a torn entry is
+# just a miss.
+ENTRY_BYTES = 16
+_SCORE_OFFSET = 1 << 31
+
+class TranspositionTable:
+    def __init__(self, size_mb: float = 16, shared: bool = False, name: str = None):
+        """
+        A private table, or with `shared` one in a new shared memory block
+        that other processes open by passing its `name` (and the same size).
+        """
+        # Largest power of two number of entries that fits the budget
+        entries = max(1, int(size_mb * (1 << 20)) // ENTRY_BYTES)
+        self.size = 1 << (entries.bit_length() - 1)
+        self.mask = self.size - 1
+        self.shm: shared_memory.SharedMemory = None
+        self.owner = False
+        if shared or name is not None:
+            self.owner = name is None
+            self.shm = shared_memory.SharedMemory(name=name, create=self.owner,
+                                                  size=ENTRY_BYTES * self.size)
+            self.keys = self.shm.buf[:8 * self.size].cast('Q')
+            self.data = self.shm.buf[8 * self.size:ENTRY_BYTES * self.size].cast('Q')
+        else:
+            self.keys = array('Q', bytes(8 * self.size))
+            self.data = array('Q', bytes(8 * self.size))
+        self.generation = 0
+        self.hits = 0
+        self.stores = 0
+
+    @property
+    def name(self) -> str | None:
+        return None if self.shm is None else self.shm.name
+
+    def clear(self) -> None:
+        if self.shm is not None:
+            self.shm.buf[:ENTRY_BYTES * self.size] = bytes(ENTRY_BYTES * self.size)
+        else:
+            self.keys = array('Q', bytes(8 * self.size))
+            self.data = array('Q', bytes(8 * self.size))
+        self.generation = 0
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory block, freeing it if this table
+        created it. Does nothing for a private table.
+        """
+        if self.shm is None:
+            return
+        self.keys.release()
+        self.data.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.shm = None
+
+    # Call once per root search so entries from older searches get replaced
+    def new_search(self) -> None:
+        self.generation = (self.generation + 1) & 63
+
+    def probe(self, key: int) -> tuple[int, int, int, int] | None:
+        """
+        Return (depth, bound, score, move) stored for key, or None.
+        """
+        index = key & self.mask
+        data = self.data[index]
+        if data == 0 or self.keys[index] ^ data != key:
+            return None
+        self.hits += 1
+        return (
+            (data >> 8) & 0xFF,
+            data & 3,
+            (data >> 32) - _SCORE_OFFSET,
+            (data >> 16) & 0xFFFF,
+        )
+
+    def store(self, key: int, depth: int, bound: int, score: int, move: int) -> None:
+        """
+        Depth-preferred replacement: a slot holding a deeper result for a
+        different position from the current search is kept.
+        """
+        index = key & self.mask
+        old = self.data[index]
+        if old and self.keys[index] ^ old != key \
+           and (old >> 2) & 63 == self.generation and (old >> 8) & 0xFF > depth:
+            return
+        if old and self.keys[index] ^ old == key and not move:
+            # keep the best move of a previous search of this position
+            move = (old >> 16) & 0xFFFF
+        data = (
+            ((score + _SCORE_OFFSET) << 32) | (move << 16)
+            | (min(depth, 0xFF) << 8) | (self.generation << 2) | bound
+        )
+        self.data[index] = data
+        self.keys[index] = key ^ data
+        self.stores += 1
+
+    def usage(self) -> float:
+        # Fraction of the first 1000 slots filled in the current generation
+        sample = min(1000, self.size)
+        used = sum(
+            1 for i in range(sample)
+            if self.data[i] and (self.data[i] >> 2) & 63 == self.generation
+        )
+        return used / sample
@@ -0,0 +1,224 @@
+# /* UciEngine.py
+
+import inspect
+import sys
+import threading
+import time
+
+from typing import TextIO
+from data.classes.Board import Board, STARTING_FEN
+from data.classes.Square import Square
+from data.classes.GameRecord import parse_move
+from data.classes.Move import is_promotion
+from data.classes.agents.ChessAgent import ChessAgent
+from data.classes.agents.MinimaxPlayer import MATE_SCORE, MATE_BOUND
+
+ENGINE_NAME = 'ai_chess_assignment'
+ENGINE_AUTHOR = 'shishirdongre'
+
+# Moves assumed left in the game when the GUI sends no movestogo
+DEFAULT_MOVES_TO_GO = 30
+# Milliseconds kept back from the clock for move transmission
+MOVE_OVERHEAD = 50
+# `go infinite` searches until `stop`; a day stands in for forever
+INFINITE_TIME = 86400.0
+
+def uci_move(board: Board, move: tuple[Square, Square]) -> str:
+    """
+    Coordinate notation of a move in the board's current position, with
+    the promotion piece the way UCI expects it ('e7e8q').
+    """
+    text = move[0].coord + move[1].coord
+    return text + 'q' if is_promotion(board.encode_move(move)) else text
+
+def uci_score(score: int) -> str:
+    if score >= MATE_BOUND:
+        return f'mate {(MATE_SCORE - score + 1) // 2}'
+    if score <= -MATE_BOUND:
+        return f'mate -{(MATE_SCORE + score) // 2}'
+    return f'cp {score}'
+
+def move_budget(remaining: int, increment: int, moves_to_go: int | None) -> float:
+    """
+    Seconds to spend on a move from the clock (milliseconds): an even
+    share of the remaining time plus most of the increment, never more
+    than half of what is left.
+    """
+    share = remaining / (moves_to_go or DEFAULT_MOVES_TO_GO) + increment * 3 / 4
+    return max(min(share, (remaining - MOVE_OVERHEAD) / 2), 1) / 1000
+
+class UciEngine:
+    """
+    Universal Chess Interface front end for any ChessAgent. Commands are
+    read on the calling thread and each `go` runs choose_action on a
+    search thread, so `stop`, `isready` and `quit` are answered while the
+    agent thinks. `stop` asks the agent to return early through
+    ChessAgent.stop; agents that ignore it simply finish their move.
+    """
+    def __init__(self, agent: ChessAgent, output: TextIO = None):
+        self.agent = agent
+        self.output = output or sys.stdout
+        self.output_lock = threading.Lock()
+        self.board = Board()
+        self.search: threading.Thread = None
+        # Set by `stop` (and `quit`); after `go infinite` the bestmove is
+        # held back until then, as the protocol requires
+        self.stopping = threading.Event()
+        # choose_action keywords the agent accepts (time_limit, depth, ...)
+        self.options = set(inspect.signature(agent.choose_action).parameters)
+        if hasattr(agent, 'on_iteration'):
+            agent.on_iteration = self.report_iteration
+
+    def send(self, line: str):
+        with self.output_lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def run(self, input: TextIO = None) -> int:
+        """
+        Answer commands until `quit` or the end of the input.
+        """
+        for line in input or sys.stdin:
+            if not self.handle(line):
+                break
+        self.stop()
+        return 0
+
+    def handle(self, line: str) -> bool:
+        """
+        Carry out one command line; False once the engine should quit.
+        """
+        words = line.split()
+        if len(words) < 1:
+            return True
+        command, args = words[0], words[1:]
+        if command == 'uci':
+            self.send(f'id name {ENGINE_NAME} ({type(self.agent).__name__})')
+            self.send(f'id author {ENGINE_AUTHOR}')
+            self.send('uciok')
+        elif command == 'isready':
+            self.send('readyok')
+        elif command == 'ucinewgame':
+            self.stop()
+            self.board = Board()
+        elif command == 'position':
+            self.stop()
+            self.set_position(args)
+        elif command == 'go':
+            self.stop()
+            self.go(args)
+        elif command == 'stop':
+            self.stop()
+        elif command == 'quit':
+            return False
+        # anything else (setoption, debug, ponderhit, ...) is ignored
+        return True
+
+    def set_position(self, args: list[str]):
+        """
+        `position startpos|fen <fen> [moves <move> ...]`. Stops at the first
+        move that is illegal here, reporting it as an info string.
+        """
+        if 'moves' in args:
+            split = args.index('moves')
+            args, moves = args[:split], args[split + 1:]
+        else:
+            moves = []
+        try:
+            if len(args) > 0 and args[0] == 'fen':
+                self.board = Board.from_fen(' '.join(args[1:]))
+            else:
+                self.board = Board.from_fen(STARTING_FEN)
+        except (ValueError, IndexError, KeyError):
+            self.send(f'info string invalid fen {" ".join(args[1:])}')
+            self.board = Board()
+            return
+        for text in moves:
+            try:
+                self.board.make_move(parse_move(self.board, text))
+            except (ValueError, IndexError):
+                self.send(f'info string illegal move {text}')
+                break
+
+    def search_limits(self, args: list[str]) -> dict:
+        """
+        choose_action keywords for the arguments of `go`, limited to those
+        the agent accepts. Without any, the agent's own budget applies.
+        """
+        values = {}
+        for i, word in enumerate(args[:-1]):
+            if word in ('wtime', 'btime', 'winc', 'binc', 'movestogo',
+                        'movetime', 'depth', 'nodes') and args[i + 1].lstrip('-').isdigit():
+                values[word] = int(args[i + 1])
+        side = 'w' if self.board.turn == 'white' else 'b'
+        limits = {}
+        if 'infinite' in args:
+            limits['time_limit'] = INFINITE_TIME
+        elif 'movetime' in values:
+            limits['time_limit'] = max(values['movetime'] - MOVE_OVERHEAD, 1) / 1000
+        elif side + 'time' in values:
+            limits['time_limit'] = move_budget(values[side + 'time'], values.get(side + 'inc', 0),
+                                               values.get('movestogo'))
+        if 'depth' in values:
+            limits['depth'] = values['depth']
+            if 'time_limit' not in limits:
+                limits['time_limit'] = None
+        if 'nodes' in values:
+            limits['node_limit'] = values['nodes']
+        return {key: value for key, value in limits.items() if key in self.options}
+
+    def go(self, args: list[str]):
+        limits = self.search_limits(args)
+        self.agent.color = self.board.turn
+        self.stopping.clear()
+        self.search = threading.Thread(target=self.search_main,
+                                       args=(self.board, limits, 'infinite' in args),
+                                       daemon=True)
+        self.search.start()
+
+    def search_main(self, board: Board, limits: dict, infinite: bool):
+        start = time.perf_counter()
+        move = self.agent.choose_action(board, **limits)
+        # search time only, not the wait for `stop` below
+        elapsed = time.perf_counter() - start
+        if infinite:
+            self.stopping.wait()
+        if not move:
+            self.send('bestmove 0000')
+            return
+        stats = getattr(self.agent, 'stats', None)
+        if stats is not None and stats.nodes > 0:
+            pv = getattr(self.agent, 'pv', None)
+            if not pv or pv[0] != move:
+                pv = [move]
+            self.send(f'info nodes {stats.nodes} nps {int(stats.nodes / max(elapsed, 1e-9))} '
+                      f'time {int(elapsed * 1000)} pv {self.format_pv(board, pv)}')
+        self.send(f'bestmove {uci_move(board, move)}')
+
+    def report_iteration(self, stats, pv: list[tuple[Square, Square]]):
+        line = f'info depth {stats.depth} score {uci_score(stats.score)} nodes {stats.nodes} ' \
+               f'nps {int(stats.nps)} time {int(stats.time * 1000)}'
+        if len(pv) > 0:
+            line += f' pv {self.format_pv(self.board, pv)}'
+        self.send(line)
+
+    def format_pv(self, board: Board, pv: list[tuple[Square, Square]]) -> str:
+        # the moves are played out so promotions are recognised past the first
+        output = []
+        for move in pv:
+            output.append(uci_move(board, move))
+            board.make_move(move)
+        for _ in pv:
+            board.unmake_move()
+        return ' '.join(output)
+
+    def stop(self):
+        """
+        End the running search, if any, and wait for its bestmove. The
+        request is repeated in case the search had not started reading it.
+        """
+        self.stopping.set()
+        while self.search is not None and self.search.is_alive():
+            self.agent.stop()
+            self.search.join(0.05)
+        self.search = None
@@ -0,0 +1,18 @@
+# /* Zobrist.py
+
+import random
+
+# Fixed seed so hashes are identical across processes and runs (the
+# opening book and shared transposition tables rely on that)
+_rng = random.Random(0x5EED)
+
+# PIECE_KEYS[color][piece type][square], indexed like Bitboard
+PIECE_KEYS: list[list[list[int]]] = [
+    [[_rng.getrandbits(64) for _ in range(64)] for _ in range(6)]
+    for _ in range(2)
+]
+# XORed in when black is to move
+SIDE_KEY: int = _rng.getrandbits(64)
+# One key per castling-rights bitmask (see Board.get_castling_rights)
+CASTLING_KEYS: list[int] = [_rng.getrandbits(64) for _ in range(16)]
+CASTLING_KEYS[0] = 0
@@ -12,4 +12,20 @@ class ChessAgent:
         self.color = color
 
     def choose_action(self, board: Board) -> tuple[Square, Square] | bool:
-        return False
\ No newline at end of file
+        return False
+
+    # Called by the match runner just before the opponent starts choosing
+    # its move on `board`, and again once it has chosen (before the move
+    # is played). Agents that think on the opponent's time override these;
+    # the board belongs to the opponent in between and must not be changed.
+    def opponent_turn_started(self, board: Board) -> None:
+        pass
+
+    def opponent_turn_ended(self, board: Board) -> None:
+        pass
+
+    # May be called from another thread while choose_action runs, to make
+    # it return its best move so far as soon as it can (the UCI `stop`
+    # command). Agents that cannot be interrupted simply finish.
+    def stop(self) -> None:
+        pass
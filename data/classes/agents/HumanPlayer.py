@@ -5,8 +5,13 @@ import typing
 
 from data.classes.Square import Square
 from data.classes.Board import Board
+from data.classes.Move import move_buffer
 from data.classes.agents.ChessAgent import ChessAgent
 
+# Frames per second while waiting for a click; the board only redraws
+# squares that changed, so idle frames cost next to nothing
+FRAME_RATE = 60
+
 class HumanPlayer(ChessAgent):
 
     def choose_action(self, board: Board):
@@ -16,11 +21,13 @@ class HumanPlayer(ChessAgent):
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     return False
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    board.reset_rendering()
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     move = self.handle_click(board, *pygame.mouse.get_pos())
                     if move is not None:
                         return move
-            board.draw()
+            board.draw(max_fps=FRAME_RATE)
 
     def handle_click(self, board: Board, mx: float, my: float) \
                      -> tuple[Square, Square]:
@@ -31,9 +38,13 @@ class HumanPlayer(ChessAgent):
             and clicked_square.occupying_piece.color == board.turn:
             board.select_square(clicked_square)
         elif board.selected_square is not None \
-             and clicked_square in \
-                 board.selected_square.occupying_piece.get_valid_moves(board):
+             and self.is_legal(board, (board.selected_square, clicked_square)):
             return (board.selected_square, clicked_square)
         else:
             board.select_square(None)
-        return None
\ No newline at end of file
+        return None
+
+    def is_legal(self, board: Board, move: tuple[Square, Square]) -> bool:
+        moves = move_buffer()
+        count = board.generate_move_codes(moves)
+        return board.encode_move(move) in moves[:count]
\ No newline at end of file
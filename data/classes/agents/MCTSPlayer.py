@@ -0,0 +1,212 @@
+# /* MCTSPlayer.py
+
+import math
+import random
+import time
+
+from collections import deque
+from data.classes.Square import Square
+from data.classes.Board import Board
+from data.classes.Bitboard import COLORS, bit_squares
+from data.classes.agents.ChessAgent import ChessAgent
+from data.classes.Telemetry import SearchStats, QUIET, MOVES, MOVE_STATS_LIMIT
+
+class _Node:
+    """
+    One position of the search tree. `wins` is the total reward from the
+    point of view of the side that played `move` into this node.
+    """
+    __slots__ = ('move', 'parent', 'hash', 'children', 'untried', 'visits', 'wins', 'terminal')
+
+    def __init__(self, move: int, parent: '_Node', key: int):
+        self.move = move
+        self.parent = parent
+        self.hash = key
+        self.children: list[_Node] = []
+        # Encoded moves not expanded yet; None until the node is first reached
+        self.untried: list[int] | None = None
+        self.visits = 0
+        self.wins = 0.0
+        # Reward for the side to move when the game is over here, else None
+        self.terminal: float | None = None
+
+class MCTSPlayer(ChessAgent):
+    """
+    Monte Carlo tree search with UCT selection. Each iteration walks the
+    tree, expands one move and finishes with a short random playout scored
+    by the static evaluation. All of it runs on the game board through
+    make_move/unmake_move, so an iteration costs the playout length plus
+    the tree depth in moves, never a board copy. After a move the subtree
+    under it is kept and reused if the opponent's reply was explored.
+    """
+    def __init__(self, color, iterations: int = None, time_limit: float = 1.0,
+                 exploration: float = 1.4, playout_depth: int = 8,
+                 verbosity: int = QUIET):
+        super().__init__(color)
+        # Budget per move: a number of playouts, or seconds if that is None
+        self.iterations = iterations
+        self.time_limit = time_limit
+        # UCT exploration constant
+        self.exploration = exploration
+        # Random moves per playout before the position is evaluated
+        self.playout_depth = playout_depth
+        self.verbosity = verbosity
+        self.root: _Node | None = None
+        # Set by stop(), possibly from another thread, to end the search
+        self.stop_requested = False
+        self.stats = SearchStats()
+        self.move_stats: deque[SearchStats] = deque(maxlen=MOVE_STATS_LIMIT)
+
+    def choose_action(self, board: Board, time_limit: float = None,
+                      iterations: int = None):
+        start = time.perf_counter()
+        self.stop_requested = False
+        self.stats = SearchStats()
+        self.move_stats.append(self.stats)
+        if time_limit is None and iterations is None:
+            iterations = self.iterations
+            time_limit = self.time_limit if iterations is None else None
+        root = self.reuse_root(board)
+        self.expand(board, root)
+        if len(root.untried) < 1 and len(root.children) < 1:
+            self.stats.time = time.perf_counter() - start
+            return False
+        # the draw rules end the game below the root, but at the root a
+        # move is still owed (the match runner declares those draws itself)
+        root.terminal = None
+        deadline = None if time_limit is None else start + time_limit
+        playouts = 0
+        # at least one playout, so the root always has a child to return
+        while True:
+            self.iterate(board, root)
+            playouts += 1
+            if (iterations is not None and playouts >= iterations) or self.stop_requested:
+                break
+            # the clock is read after the first playout and every 16 after it
+            if deadline is not None and playouts & 15 == 1 and time.perf_counter() >= deadline:
+                break
+        best = max(root.children, key=lambda child: child.visits)
+        self.root = best
+        best.parent = None
+        self.stats.playouts = playouts
+        self.stats.nodes = root.visits
+        self.stats.time = time.perf_counter() - start
+        move = board.decode_move(best.move)
+        if self.verbosity >= MOVES:
+            print(f'{self.color} {move[0].coord}{move[1].coord} playouts {playouts} '
+                  f'pps {self.stats.playouts_per_second:.0f} tree {root.visits} '
+                  f'expected {best.wins / max(best.visits, 1):.2f} '
+                  f'time {self.stats.time * 1000:.0f}ms')
+        return move
+
+    def stop(self):
+        self.stop_requested = True
+
+    def reuse_root(self, board: Board) -> _Node:
+        """
+        The node of the current position from the previous search (the
+        opponent's reply below the move played), or a fresh root.
+        """
+        if self.root is not None:
+            for child in self.root.children:
+                if child.hash == board.hash:
+                    child.parent = None
+                    return child
+        return _Node(0, None, board.hash)
+
+    def expand(self, board: Board, node: _Node):
+        if node.untried is not None:
+            return
+        moves = board.get_all_valid_moves(board.turn)
+        node.untried = [board.encode_move(move) for move in moves]
+        if len(moves) < 1:
+            node.terminal = 0.0 if board.is_in_check(board.turn) else 0.5
+        elif board.is_threefold_repetition() or board.is_fifty_move_draw():
+            node.terminal = 0.5
+
+    def iterate(self, board: Board, root: _Node):
+        node = root
+        played = 0
+        # Selection: follow UCT while every move of the node has been tried
+        while node.terminal is None and len(node.untried) < 1:
+            node = self.select(node)
+            board.make_move(board.decode_move(node.move))
+            played += 1
+            self.expand(board, node)
+        # Expansion: add one untried move
+        if node.terminal is None:
+            move = node.untried.pop(random.randrange(len(node.untried)))
+            board.make_move(board.decode_move(move))
+            played += 1
+            child = _Node(move, node, board.hash)
+            node.children.append(child)
+            node = child
+            self.expand(board, node)
+        reward = node.terminal if node.terminal is not None else self.playout(board)
+        for _ in range(played):
+            board.unmake_move()
+        # Backpropagation: the reward is for the side to move at the leaf
+        while node is not None:
+            node.visits += 1
+            node.wins += 1.0 - reward
+            reward = 1.0 - reward
+            node = node.parent
+
+    def select(self, node: _Node) -> _Node:
+        scale = self.exploration * math.sqrt(math.log(node.visits))
+        best = None
+        best_score = -1.0
+        for child in node.children:
+            score = child.wins / child.visits + scale / math.sqrt(child.visits)
+            if score > best_score:
+                best = child
+                best_score = score
+        return best
+
+    def playout(self, board: Board) -> float:
+        """
+        Play up to playout_depth random moves from the board and undo them.
+        Returns the expected result for the side to move before the
+        playout: 1 win, 0.5 draw, 0 loss.
+        """
+        color = board.turn
+        played = 0
+        reward = None
+        while played < self.playout_depth:
+            move = self.random_move(board)
+            if move is None:
+                if not board.is_in_check(board.turn):
+                    reward = 0.5
+                else:
+                    reward = 0.0 if board.turn == color else 1.0
+                break
+            board.make_move(move)
+            played += 1
+        if reward is None:
+            score = board.evaluate()
+            if color == 'black':
+                score = -score
+            # Centipawns to an expected score, a pawn ahead being about 64%
+            reward = 1.0 / (1.0 + 10.0 ** (-score / 400.0))
+        for _ in range(played):
+            board.unmake_move()
+        return reward
+
+    def random_move(self, board: Board) -> tuple[Square, Square] | None:
+        """
+        A random legal move (castling aside) for the playouts, or None if
+        there is none. Pieces are tried in random order and only the first
+        one that can move has its moves generated, which is much cheaper
+        than the full move list.
+        """
+        if board.bitboard is None:
+            moves = board.get_all_valid_moves(board.turn)
+            return random.choice(moves) if len(moves) > 0 else None
+        squares = board.squares
+        pieces = bit_squares(board.bitboard.occupancy[COLORS[board.turn]])
+        random.shuffle(pieces)
+        for i in pieces:
+            targets = board.get_bitboard_valid_moves(squares[i].occupying_piece)
+            if len(targets) > 0:
+                return squares[i], random.choice(targets)
+        return None
@@ -1,112 +1,609 @@
-import random
+import multiprocessing
+import time
+from array import array
+from typing import Callable
+import weakref
+from collections import deque
+from multiprocessing import shared_memory
 from data.classes.Square import Square
 from data.classes.Board import Board
+from data.classes.Bitboard import COLORS, NOTATIONS
 from data.classes.agents.ChessAgent import ChessAgent
-import copy
-import numpy as np
-import random
-
-# Piece weights
-PIECE_WEIGHTS = {
-    " ": 1,
-    "N": 3,
-    "B": 3,
-    "R": 5,
-    "Q": 9,
-    # Assign a very high value to the king to avoid losing it
-    "K": 1000  
-}
+from data.classes.TranspositionTable import TranspositionTable, EXACT, LOWER, UPPER
+from data.classes.Evaluation import Evaluation, PIECE_WEIGHTS, DEFAULT_EVALUATION
+from data.classes.Telemetry import SearchStats, QUIET, MOVES, ITERATIONS, MOVE_STATS_LIMIT
+from data.classes.OpeningBook import OpeningBook
+from data.classes.Tablebase import Tablebases
+from data.classes.Move import move_buffer, move_index, from_square, to_square
+
+# PIECE_WEIGHTS indexed by bitboard piece type, for static exchange evaluation
+SEE_VALUES = [PIECE_WEIGHTS[notation] for notation in NOTATIONS]
+
+# Score of a checkmate; integral so it fits the transposition table
+MATE_SCORE = 1000000
+# Scores beyond this are mates, stored in the table relative to the node
+MATE_BOUND = MATE_SCORE - 1000
+INFINITY = MATE_SCORE + 1
+MAX_PLY = 128
+
+# Move ordering keys: table move, then captures (MVV-LVA), killers, history
+_TT_MOVE_KEY = 1 << 30
+_CAPTURE_KEY = 1 << 24
+_KILLER_KEYS = (1 << 23, 1 << 22)
+_HISTORY_LIMIT = 1 << 21
 
 class MinimaxPlayer(ChessAgent):
-    def choose_action(self, board: Board, depth: int = 3):
-        # Start Minimax as the maximizer
-        best_move = self.minimax(board, depth, True)[1]
+    def __init__(self, color, tt_size_mb: float = 16, time_limit: float = 1.0,
+                 node_limit: int = None, max_depth: int = 64,
+                 evaluation: Evaluation = None, verbosity: int = QUIET,
+                 book: OpeningBook | str = None, book_weighted: bool = True,
+                 tablebases: Tablebases | str = None, workers: int = 1,
+                 ponder: bool = False):
+        super().__init__(color)
+        # Opening book (or the path of one) played from before searching
+        self.book = OpeningBook(book) if isinstance(book, str) else book
+        self.book_weighted = book_weighted
+        # Endgame tables (or their directory) probed below the root
+        self.tablebases = Tablebases(tablebases) if isinstance(tablebases, str) else tablebases
+        # None is the default (PIECE_WEIGHTS material + tables); installed
+        # on the board before every search, as the opponent may use another
+        self.evaluation = DEFAULT_EVALUATION if evaluation is None else evaluation
+        # Kept across moves so consecutive searches reuse each other's work;
+        # in shared memory when helper processes search alongside
+        self.tt = TranspositionTable(tt_size_mb, shared=workers > 1 or ponder)
+        self.tt_size_mb = tt_size_mb
+        # Processes searching in total (Lazy SMP): workers - 1 helpers are
+        # started on the first move and fill the shared table while this
+        # process searches; their results only reach it through the table
+        self.workers = workers
+        # Search the expected reply on the opponent's time, in the helpers
+        # (or in one helper of its own when workers is 1)
+        self.ponder = ponder
+        self.ponder_hash: int = None
+        self.helpers: list[multiprocessing.Process] = []
+        self.finalizer: weakref.finalize = None
+        self.tasks: multiprocessing.Queue = None
+        # Helpers search while control[0] holds their search id
+        self.control = None
+        self.helper = False
+        self.search_id = 0
+        # Default budget per move; choose_action arguments override it
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.max_depth = max_depth
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        self.history = [[0] * 4096, [0] * 4096]
+        # Move codes (see Move.py) generated at each ply; the search works
+        # on codes and only choose_action deals in Square pairs
+        self.move_buffers = [move_buffer() for _ in range(MAX_PLY + 1)]
+        self.nodes = 0
+        self.depth_reached = 0
+        self.pv: list[tuple[Square, Square]] = []
+        self.stopped = False
+        self.deadline: float = None
+        self.node_budget: int = None
+        # Set by stop(), possibly from another thread, to end the search
+        self.stop_requested = False
+        # Called with the stats and principal variation after each
+        # completed iteration (the UCI engine reports them as info lines)
+        self.on_iteration: Callable[[SearchStats, list[tuple[Square, Square]]], None] = None
+        # Telemetry.QUIET, MOVES or ITERATIONS
+        self.verbosity = verbosity
+        # Counters of the latest choose_action call, and of the last
+        # MOVE_STATS_LIMIT calls
+        self.stats = SearchStats()
+        self.move_stats: deque[SearchStats] = deque(maxlen=MOVE_STATS_LIMIT)
+
+    def choose_action(self, board: Board, time_limit: float = None,
+                      node_limit: int = None, depth: int = None):
+        """
+        Search with iterative deepening until the time or node budget is
+        spent (or `depth` is completed) and return the best move found.
+        A fixed depth without a time limit searches to that depth exactly.
+        """
+        start = time.perf_counter()
+        self.stats = SearchStats()
+        self.move_stats.append(self.stats)
+        self.stats.move_generations += 1
+        count = board.generate_move_codes(self.move_buffers[0])
+        if count < 1:
+            self.stats.time = time.perf_counter() - start
+            return False
+        if self.book is not None:
+            book_move = self.book.choose(board, self.book_weighted)
+            if book_move is not None:
+                self.stats.book = True
+                self.stats.time = time.perf_counter() - start
+                if self.verbosity >= MOVES:
+                    print(f'{self.color} {book_move[0].coord}{book_move[1].coord} book')
+                return book_move
+        if time_limit is None and depth is None:
+            time_limit = self.time_limit
+        if node_limit is None:
+            node_limit = self.node_limit
+        if board.evaluation is not self.evaluation:
+            board.set_evaluation(self.evaluation)
+        self.stats.ponder_hit = self.ponder_hash is not None and self.ponder_hash == board.hash
+        self.ponder_hash = None
+        self.start_search(time_limit, node_limit)
+        if self.workers > 1:
+            self.start_helpers(board, depth or self.max_depth)
+        moves = self.move_buffers[0][:count]
+        best_move = moves[0]
+        for current_depth in range(1, (depth or self.max_depth) + 1):
+            score, move = self.search_root(board, moves, current_depth, best_move)
+            if move is not None:
+                # an interrupted iteration still searched the previous best
+                # move first, so its best-so-far is at least as good
+                best_move = move
+            if self.stopped:
+                break
+            self.depth_reached = current_depth
+            self.pv = self.principal_variation(board, current_depth)
+            self.stats.depth = current_depth
+            self.stats.score = score
+            if self.on_iteration is not None:
+                self.stats.nodes = self.nodes
+                self.stats.time = time.perf_counter() - start
+                self.on_iteration(self.stats, self.pv)
+            if self.verbosity >= ITERATIONS:
+                print(f'{self.color} depth {current_depth} score {score} nodes {self.nodes} '
+                      f'pv {" ".join(a.coord + b.coord for a, b in self.pv)}')
+            if abs(score) >= MATE_BOUND:
+                break
+        if self.workers > 1:
+            self.control[0] = 0
+        self.stats.nodes = self.nodes
+        self.stats.time = time.perf_counter() - start
+        best_move = board.decode_move(best_move)
+        if self.verbosity >= MOVES:
+            print(f'{self.color} {best_move[0].coord}{best_move[1].coord} {self.stats}')
         return best_move
 
-    def minimax(self, board: Board, depth: int, is_maximizing_player: bool):
-        print('depth: ', depth)
-        if depth == 0 or self.is_game_over(board):
-            if self.is_game_over(board):
-                if self.get_winner(board) == self.color:  
-                    return float('inf'), None 
+    def start_search(self, time_limit: float, node_limit: int):
+        self.tt.new_search()
+        self.nodes = 0
+        self.depth_reached = 0
+        self.stopped = False
+        self.stop_requested = False
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.node_budget = node_limit
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        for table in self.history:
+            for i in range(4096):
+                table[i] >>= 2
+
+    def check_limits(self):
+        if self.stop_requested \
+           or (self.node_budget is not None and self.nodes >= self.node_budget) \
+           or (self.deadline is not None and time.perf_counter() >= self.deadline) \
+           or (self.helper and self.control[0] != self.search_id):
+            self.stopped = True
+
+    def start_helpers(self, board: Board, depth: int):
+        """
+        Hand the position to the helper processes (starting them the first
+        time). Each searches it until the main search clears control[0].
+        """
+        if len(self.helpers) < 1:
+            control = shared_memory.SharedMemory(create=True, size=8)
+            self.control = control.buf.cast('Q')
+            self.control[0] = 0
+            self.tasks = multiprocessing.Queue()
+            tablebases = None if self.tablebases is None else self.tablebases.directory
+            for index in range(1, max(self.workers, 2 if self.ponder else 1)):
+                helper = multiprocessing.Process(
+                    target=_helper_main, daemon=True,
+                    args=(index, self.tt.name, self.tt_size_mb, control.name, self.tasks,
+                          self.evaluation, tablebases))
+                helper.start()
+                self.helpers.append(helper)
+            self.finalizer = weakref.finalize(self, _stop_helpers, self.helpers, self.tasks,
+                                              self.control, control, self.tt)
+        self.search_id = (self.search_id + 1) & 0xFFFFFFFF or 1
+        self.control[0] = self.search_id
+        # the board pickles with its repetition counts (Board.__reduce__)
+        for _ in self.helpers:
+            self.tasks.put((board, self.search_id, self.tt.generation, depth))
+
+    def opponent_turn_started(self, board: Board):
+        """
+        With pondering on, search the position after the reply predicted
+        by the last principal variation until the opponent has moved. A
+        hit finds the helpers' results in the shared table; a miss only
+        costs the helpers' time.
+        """
+        if not self.ponder or len(self.pv) < 2 or len(board.move_stack) < 1:
+            return
+        played = board.move_stack[-1]
+        if board.encode_move(self.pv[0]) != board.encode_move((played[0], played[1])):
+            return
+        guess = Board.from_fen(board.to_fen())
+        guess.repetitions = dict(board.repetitions)
+        reply = guess.decode_move(board.encode_move(self.pv[1]))
+        if reply not in guess.get_all_valid_moves(guess.turn):
+            return
+        guess.make_move(reply)
+        guess.set_evaluation(self.evaluation)
+        self.ponder_hash = guess.hash
+        self.start_helpers(guess, self.max_depth)
+
+    def opponent_turn_ended(self, board: Board):
+        if self.control is not None:
+            self.control[0] = 0
+
+    def stop(self):
+        self.stop_requested = True
+
+    def close(self):
+        """
+        Stop the helper processes and free the shared memory. Also done
+        when the player is garbage collected or the interpreter exits.
+        """
+        if self.finalizer is not None:
+            self.finalizer()
+        self.helpers = []
+        self.control = None
+
+    def helper_search(self, board: Board, index: int, depth: int):
+        """
+        Iterative deepening for a helper process: odd helpers start one
+        ply deeper so the processes spread over two depths, and the search
+        runs until the main process stops it.
+        """
+        self.nodes = 0
+        self.stopped = False
+        self.deadline = None
+        self.node_budget = None
+        count = board.generate_move_codes(self.move_buffers[0])
+        if count < 1:
+            return
+        moves = self.move_buffers[0][:count]
+        best_move = moves[0]
+        for current_depth in range(1 + index % 2, depth + 2):
+            _, move = self.search_root(board, moves, current_depth, best_move)
+            if self.stopped:
+                break
+            if move is not None:
+                best_move = move
+
+    def search_root(self, board: Board, moves: array, depth: int, pv_move: int):
+        """
+        Search every root move (codes) with a full window. The previous
+        iteration's best move is searched first.
+        """
+        alpha = -INFINITY
+        best_move = None
+        for move in self.order_moves(board, moves, len(moves), 0, pv_move):
+            board.make_move_code(move)
+            score = -self.alpha_beta(board, depth - 1, -INFINITY, -alpha, 1)
+            board.unmake_move()
+            if self.stopped:
+                break
+            if score > alpha:
+                alpha = score
+                best_move = move
+        if not self.stopped:
+            self.tt.store(board.hash, depth, EXACT, self.score_to_tt(alpha, 0), best_move)
+        return alpha, best_move
+
+    def alpha_beta(self, board: Board, depth: int, alpha: int, beta: int, ply: int):
+        """
+        Negamax alpha-beta search. Scores are from the side to move's point
+        of view; mates are scored as MATE_SCORE minus the distance in plies.
+        """
+        self.nodes += 1
+        self.check_limits()
+        if self.stopped:
+            return 0
+        # A position already on the game or search path is scored as a
+        # draw (repeating it is the opponent's choice too), as is one past
+        # the fifty-move limit
+        if board.repetitions[board.hash] > 1 or board.halfmove >= 100:
+            return 0
+        if self.tablebases is not None and board.piece_count() <= self.tablebases.max_pieces:
+            score = self.probe_tablebases(board, ply)
+            if score is not None:
+                return score
+        key = board.hash
+        tt_move = 0
+        entry = self.tt.probe(key)
+        if entry is not None:
+            entry_depth, bound, score, tt_move = entry
+            if entry_depth >= depth:
+                score = self.score_from_tt(score, ply)
+                if bound == EXACT \
+                   or (bound == LOWER and score >= beta) \
+                   or (bound == UPPER and score <= alpha):
+                    self.stats.tt_cutoffs += 1
+                    return score
+        if depth <= 0 or ply >= MAX_PLY - 1:
+            return self.quiescence(board, alpha, beta, ply)
+        self.stats.move_generations += 1
+        moves = self.move_buffers[ply]
+        count = board.generate_move_codes(moves)
+        if count < 1:
+            # checkmate or stalemate
+            self.stats.check_tests += 1
+            return -MATE_SCORE + ply if board.is_in_check(board.turn) else 0
+
+        alpha_orig = alpha
+        best_score = -INFINITY
+        best_move = 0
+        squares = board.squares
+        for move in self.order_moves(board, moves, count, ply, tt_move):
+            quiet = squares[to_square(move)].occupying_piece is None
+            board.make_move_code(move)
+            score = -self.alpha_beta(board, depth - 1, -beta, -alpha, ply + 1)
+            board.unmake_move()
+            if self.stopped:
+                return 0
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self.stats.cutoffs += 1
+                        if quiet:
+                            self.update_quiet_stats(board, move, depth, ply)
+                        break
+        if best_score <= alpha_orig:
+            bound = UPPER
+        elif best_score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.tt.store(key, depth, bound, self.score_to_tt(best_score, ply), best_move)
+        return best_score
+
+    def quiescence(self, board: Board, alpha: int, beta: int, ply: int):
+        """
+        Search captures only until the position is quiet, so the static
+        evaluation is never taken in the middle of an exchange. The side to
+        move may stand pat on the static score; captures that lose material
+        by static exchange evaluation are pruned. In check, all evasions
+        are searched instead.
+        """
+        self.nodes += 1
+        self.check_limits()
+        if self.stopped:
+            return 0
+        if self.tablebases is not None and board.piece_count() <= self.tablebases.max_pieces:
+            score = self.probe_tablebases(board, ply)
+            if score is not None:
+                return score
+        stats = self.stats
+        stats.check_tests += 1
+        buffer = self.move_buffers[ply]
+        if board.is_in_check(board.turn):
+            stats.move_generations += 1
+            count = board.generate_move_codes(buffer)
+            if count < 1:
+                return -MATE_SCORE + ply
+            if ply >= MAX_PLY - 1:
+                return self.evaluate(board)
+            best_score = -INFINITY
+            moves = self.order_moves(board, buffer, count, ply, 0)
+        else:
+            best_score = self.evaluate(board)
+            if best_score >= beta or ply >= MAX_PLY - 1:
+                return best_score
+            if best_score > alpha:
+                alpha = best_score
+            stats.move_generations += 1
+            count = board.generate_move_codes(buffer, captures_only=True)
+            moves = [
+                move for move in self.order_captures(board, buffer, count)
+                if self.see(board, move) >= 0
+            ]
+        for move in moves:
+            board.make_move_code(move)
+            score = -self.quiescence(board, -beta, -alpha, ply + 1)
+            board.unmake_move()
+            if self.stopped:
+                return 0
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        stats.cutoffs += 1
+                        break
+        return best_score
+
+    def see(self, board: Board, move: int) -> int:
+        """
+        Static exchange evaluation of a capture in PIECE_WEIGHTS units.
+        Taking an equal or more valuable piece returns the gain of the first
+        capture, a lower bound that already shows it cannot lose material.
+        """
+        from_sq = from_square(move)
+        to_sq = to_square(move)
+        attacker = board.squares[from_sq].occupying_piece
+        victim = board.squares[to_sq].occupying_piece
+        if PIECE_WEIGHTS[victim.notation] >= PIECE_WEIGHTS[attacker.notation]:
+            return PIECE_WEIGHTS[victim.notation] - PIECE_WEIGHTS[attacker.notation]
+        if board.bitboard is None:
+            return 0
+        return board.bitboard.see(from_sq, to_sq, SEE_VALUES)
+
+    def order_captures(self, board: Board, moves: array, count: int) -> list[int]:
+        # Most valuable victim first, least valuable attacker breaks ties
+        squares = board.squares
+        return sorted(moves[:count], key=lambda move: (
+            PIECE_WEIGHTS[squares[to_square(move)].occupying_piece.notation] * 1024
+            - PIECE_WEIGHTS[squares[from_square(move)].occupying_piece.notation]
+        ), reverse=True)
+
+    def order_moves(self, board: Board, moves: array, count: int,
+                    ply: int, tt_move: int) -> list[int]:
+        """
+        Sort the first count move codes: table/PV move, winning and even
+        captures by MVV-LVA, killer moves, quiet moves by history score,
+        then losing captures.
+        """
+        killers = self.killers[ply]
+        history = self.history[COLORS[board.turn]]
+        squares = board.squares
+        keys = []
+        for i in range(count):
+            code = moves[i]
+            victim = squares[to_square(code)].occupying_piece
+            if code == tt_move:
+                keys.append(_TT_MOVE_KEY)
+            elif victim is not None:
+                see = self.see(board, code)
+                if see < 0:
+                    keys.append(see)
                 else:
-                    return float('-inf'), None  
+                    keys.append(_CAPTURE_KEY + PIECE_WEIGHTS[victim.notation] * 1024
+                                - PIECE_WEIGHTS[squares[from_square(code)].occupying_piece.notation])
+            elif code == killers[0]:
+                keys.append(_KILLER_KEYS[0])
+            elif code == killers[1]:
+                keys.append(_KILLER_KEYS[1])
             else:
-                return self.evaluate_board(board), None
-
-
-        possible_moves = self.get_all_possible_moves(board)
-        print('possible_moves', len(possible_moves), possible_moves)
-        if len(possible_moves) > 2:
-            # possible_moves = np.random.choice(possible_moves, 5, replace=False).tolist()
-            possible_moves = random.sample(possible_moves, 2)
-
-        print("possible_movies", len(possible_moves), possible_moves)
-
-        if is_maximizing_player:
-            # Maximizing player's turn
-            max_eval = float('-inf')
-            best_move = None
-            for move in possible_moves:
-                board_copy = copy.deepcopy(board)
-                self.make_move(board_copy, move)
-                eval = self.minimax(board_copy, depth - 1, False)[0]
-                print('eval score 54: ', eval, max_eval)
-                if eval > max_eval:
-                    max_eval = eval
-                    best_move = move
-            return max_eval, best_move
-        else:
-            # Minimizing opponent's turn
-            min_eval = float('inf')
-            best_move = None
-            for move in possible_moves:
-                board_copy = copy.deepcopy(board)
-                self.make_move(board_copy, move)
-                eval = self.minimax(board_copy, depth - 1, True)[0]
-                print('eval score 67: ', eval, min_eval)
-                if eval < min_eval:
-                    min_eval = eval
-                    best_move = move
-            return min_eval, best_move
+                keys.append(history[move_index(code)])
+        order = sorted(range(count), key=keys.__getitem__, reverse=True)
+        return [moves[i] for i in order]
+
+    def update_quiet_stats(self, board: Board, move: int, depth: int, ply: int):
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        history = self.history[COLORS[board.turn]]
+        code = move_index(move)
+        history[code] += depth * depth
+        if history[code] >= _HISTORY_LIMIT:
+            for i in range(4096):
+                history[i] >>= 1
+
+    def score_to_tt(self, score: int, ply: int) -> int:
+        # Mate scores are stored relative to the node, not the root
+        if score >= MATE_BOUND:
+            return score + ply
+        if score <= -MATE_BOUND:
+            return score - ply
+        return score
+
+    def score_from_tt(self, score: int, ply: int) -> int:
+        if score >= MATE_BOUND:
+            return score - ply
+        if score <= -MATE_BOUND:
+            return score + ply
+        return score
+
+    def principal_variation(self, board: Board, depth: int) -> list[tuple[Square, Square]]:
+        """
+        Follow best moves stored in the transposition table from the root.
+        """
+        pv = []
+        while len(pv) < depth:
+            entry = self.tt.probe(board.hash)
+            if entry is None or not entry[3]:
+                break
+            move = board.decode_move(entry[3])
+            piece = move[0].occupying_piece
+            if piece is None or piece.color != board.turn \
+               or move[1] not in piece.get_valid_moves(board):
+                break
+            board.make_move(move)
+            pv.append(move)
+        for _ in pv:
+            board.unmake_move()
+        return pv
+
+    def probe_tablebases(self, board: Board, ply: int) -> int | None:
+        """
+        Exact score of a position covered by the endgame tables, with table
+        wins and losses scored as mates at their distance, or None. The
+        search only calls it once few enough pieces are left (a popcount),
+        so the middlegame never reaches the table code.
+        """
+        value = self.tablebases.probe(board)
+        if value is None:
+            return None
+        self.stats.tb_hits += 1
+        if value > 0:
+            return MATE_SCORE - ply - value
+        if value < 0:
+            return -MATE_SCORE + ply - value - 1
+        return 0
+
+    def evaluate(self, board: Board) -> int:
+        # Negamax needs the score for the side to move
+        self.stats.leaf_evals += 1
+        score = board.evaluate()
+        return score if board.turn == 'white' else -score
 
     def evaluate_board(self, board: Board):
         """
-        Evaluate the board by calculating the difference in the sum of the piece weights
-        for the current player and the opponent.
-        """
-        score = 0
-        for square in board.squares:
-            piece = square.occupying_piece
-            if piece is not None:
-                print('piece: ', piece.color, self.color, piece.notation, PIECE_WEIGHTS[piece.notation])
-                # print('piece: ', piece)
-                if piece.color == self.color:  # Maximizing player's piece
-                    score += PIECE_WEIGHTS[piece.notation]
-                else:  # Minimizing player's piece
-                    score -= PIECE_WEIGHTS[piece.notation]
-            print('score: ', score)
-        return score
+        Evaluate the board for this player in centipawns: material from
+        PIECE_WEIGHTS plus piece-square tables, tapered between middlegame
+        and endgame. The board keeps the totals up to date as pieces move,
+        so this costs O(1).
+        """
+        score = board.evaluate()
+        return score if self.color == 'white' else -score
 
     def get_all_possible_moves(self, board: Board):
         """
-        Get all possible moves for the current player.
+        Get all possible moves for the side to move.
         """
-        possible_moves = []
-        for square in board.squares:
-            if square.occupying_piece != None \
-               and square.occupying_piece.color == self.color:
-                for target in square.occupying_piece.get_valid_moves(board):
-                    possible_moves.append((square, target))
-        return possible_moves
+        return board.get_all_valid_moves(board.turn)
 
     def make_move(self, board: Board, move: tuple[Square, Square]):
         """
         Make a move on the board by moving a piece from the start square to the target square.
+        Use board.unmake_move() to take it back.
         """
-        start_square, target_square = move
-        target_square.occupying_piece = start_square.occupying_piece
-        start_square.occupying_piece = None
+        # The move's squares may belong to another board (e.g. a copy),
+        # so resolve them on the board being modified
+        board.make_move((
+            board.get_square_from_pos(move[0].pos),
+            board.get_square_from_pos(move[1].pos)
+        ))
 
     def is_game_over(self, board: Board):
         return board.is_in_checkmate(board.turn)
+
+def _helper_main(index: int, tt_name: str, tt_size_mb: float, control_name: str,
+                 tasks: multiprocessing.Queue, evaluation: Evaluation, tablebases: str):
+    """
+    Helper process loop: search each position posted by the main process
+    into the shared table until told to stop, then wait for the next one.
+    """
+    player = MinimaxPlayer('white', tt_size_mb=0, evaluation=evaluation, tablebases=tablebases)
+    player.tt = TranspositionTable(tt_size_mb, name=tt_name)
+    control = shared_memory.SharedMemory(name=control_name)
+    player.control = control.buf.cast('Q')
+    player.helper = True
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        board, player.search_id, player.tt.generation, depth = task
+        if player.control[0] != player.search_id:
+            continue
+        board.set_evaluation(evaluation)
+        player.helper_search(board, index, depth)
+    player.control.release()
+    control.close()
+    player.tt.close()
+
+def _stop_helpers(helpers: list[multiprocessing.Process], tasks: multiprocessing.Queue,
+                  control: memoryview, control_shm: shared_memory.SharedMemory,
+                  tt: TranspositionTable):
+    control[0] = 0
+    for _ in helpers:
+        tasks.put(None)
+    for helper in helpers:
+        helper.join(1.0)
+        if helper.is_alive():
+            helper.terminate()
+    control.release()
+    control_shm.close()
+    control_shm.unlink()
+    tt.close()
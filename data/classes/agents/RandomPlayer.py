@@ -8,12 +8,7 @@ from data.classes.agents.ChessAgent import ChessAgent
 
 class RandomPlayer(ChessAgent):
     def choose_action(self, board: Board):
-        possible_moves: list[tuple[Square, Square]] = []
-        for square in board.squares:
-            if square.occupying_piece != None \
-               and square.occupying_piece.color == self.color:
-                for target in square.occupying_piece.get_valid_moves(board):
-                    possible_moves.append((square, target))
+        possible_moves: list[tuple[Square, Square]] = board.get_all_valid_moves(self.color)
         if len(possible_moves) < 1:
             return False
         return random.choice(possible_moves)
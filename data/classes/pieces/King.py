@@ -1,14 +1,12 @@
 # /* King.py
 
-import pygame
 from data.classes.Piece import Piece
+from data.classes.Sprites import get_sprite
 
 class King(Piece):
     def __init__(self, pos, color, board):
         super().__init__(pos, color, board)
-        img_path = 'data/imgs/' + color + '_king.png'
-        self.img = pygame.image.load(img_path)
-        self.img = pygame.transform.scale(self.img, (board.tile_width - 20, board.tile_height - 20))
+        self.img = get_sprite('king', color, board)
         self.notation = 'K'
 
     def get_possible_moves(self, board):
@@ -39,48 +37,48 @@ class King(Piece):
         return output
 
     def can_castle(self, board):
-        if not self.has_moved:
-            if self.color == 'white':
-                queenside_rook = board.get_piece_from_pos((0, 7))
-                kingside_rook = board.get_piece_from_pos((7, 7))
-                if queenside_rook != None:
-                    if not queenside_rook.has_moved:
-                        if [
-                            board.get_piece_from_pos((i, 7)) for i in range(1, 4)
-                        ] == [None, None, None]:
-                            return 'queenside'
-                if kingside_rook != None:
-                    if not kingside_rook.has_moved:
-                        if [
-                            board.get_piece_from_pos((i, 7)) for i in range(5, 7)
-                        ] == [None, None]:
-                            return 'kingside'
-            elif self.color == 'black':
-                queenside_rook = board.get_piece_from_pos((0, 0))
-                kingside_rook = board.get_piece_from_pos((7, 0))
-                if queenside_rook != None:
-                    if not queenside_rook.has_moved:
-                        if [
-                            board.get_piece_from_pos((i, 0)) for i in range(1, 4)
-                        ] == [None, None, None]:
-                            return 'queenside'
-                if kingside_rook != None:
-                    if not kingside_rook.has_moved:
-                        if [
-                            board.get_piece_from_pos((i, 0)) for i in range(5, 7)
-                        ] == [None, None]:
-                            return 'kingside'
+        if self.can_castle_side(board, 'queenside'):
+            return 'queenside'
+        if self.can_castle_side(board, 'kingside'):
+            return 'kingside'
+
+    # The king and rook must be unmoved, the squares between them empty,
+    # and the king may not castle out of, through or into check
+    def can_castle_side(self, board, side):
+        if self.has_moved:
+            return False
+        if side == 'queenside':
+            rook_x, between, step = 0, range(1, 4), -1
+        else:
+            rook_x, between, step = 7, range(5, 7), 1
+        rook = board.get_piece_from_pos((rook_x, self.y))
+        if rook == None or rook.notation != 'R' or rook.color != self.color \
+           or rook.has_moved:
+            return False
+        for i in between:
+            if board.get_piece_from_pos((i, self.y)) != None:
+                return False
+        if board.is_in_check(self.color):
+            return False
+        for i in (1, 2):
+            if board.is_in_check(self.color,
+                                 board_change=[self.pos, (self.x + step * i, self.y)]):
+                return False
+        return True
 
     def get_valid_moves(self, board):
-        output = []
-        for square in self.get_moves(board):
-            if not board.is_in_check(self.color, board_change=[self.pos, square.pos]):
-                output.append(square)
-        if self.can_castle(board) == 'queenside':
+        if board.bitboard is not None:
+            output = board.get_bitboard_valid_moves(self)
+        else:
+            output = []
+            for square in self.get_moves(board):
+                if not board.is_in_check(self.color, board_change=[self.pos, square.pos]):
+                    output.append(square)
+        if self.can_castle_side(board, 'queenside'):
             output.append(
                 board.get_square_from_pos((self.x - 2, self.y))
             )
-        if self.can_castle(board) == 'kingside':
+        if self.can_castle_side(board, 'kingside'):
             output.append(
                 board.get_square_from_pos((self.x + 2, self.y))
             )
@@ -1,15 +1,12 @@
 # /* Pawn.py
 
-import pygame
-
 from data.classes.Piece import Piece
+from data.classes.Sprites import get_sprite
 
 class Pawn(Piece):
     def __init__(self, pos, color, board):
         super().__init__(pos, color, board)
-        img_path = 'data/imgs/' + color + '_pawn.png'
-        self.img = pygame.image.load(img_path)
-        self.img = pygame.transform.scale(self.img, (board.tile_width - 35, board.tile_height - 35))
+        self.img = get_sprite('pawn', color, board, padding=35)
         self.notation = ' '
 
     def get_possible_moves(self, board):
@@ -33,6 +30,8 @@ class Pawn(Piece):
         return output
 
     def get_moves(self, board):
+        if board.bitboard is not None:
+            return board.get_bitboard_moves(self)
         output = []
         for square in self.get_possible_moves(board):
             if square.occupying_piece != None:
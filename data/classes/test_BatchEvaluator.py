@@ -0,0 +1,50 @@
+# /* test_BatchEvaluator.py
+
+import random
+
+from data.classes.Board import Board
+from data.classes.Bitboard import COLORS, PIECE_TYPES
+from data.classes.BatchEvaluator import BatchEvaluator, encode_boards, one_hot
+from data.classes.agents.MinimaxPlayer import MinimaxPlayer
+
+def random_positions(count: int, seed: int = 0) -> list[Board]:
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        board = Board()
+        for _ in range(rng.randrange(0, 120)):
+            moves = board.get_all_valid_moves(board.turn)
+            if len(moves) < 1:
+                break
+            board.make_move(rng.choice(moves))
+        boards.append(board)
+    return boards
+
+def test_scores_match_scalar_evaluate_board():
+    boards = random_positions(60)
+    evaluator = BatchEvaluator()
+    for color in ('white', 'black'):
+        player = MinimaxPlayer(color)
+        expected = [player.evaluate_board(board) for board in boards]
+        assert evaluator.evaluate(boards, color).tolist() == expected
+
+def test_mobility_matches_pseudo_legal_moves():
+    boards = random_positions(20, seed=1)
+    mobility = BatchEvaluator().mobility(encode_boards(boards))
+    for board, value in zip(boards, mobility.tolist()):
+        expected = 0
+        for square in board.squares:
+            piece = square.occupying_piece
+            if piece is not None and piece.notation != ' ':
+                moves = board.bitboard.targets(
+                    COLORS[piece.color], PIECE_TYPES[piece.notation],
+                    square.y * 8 + square.x, piece.has_moved
+                ).bit_count()
+                expected += moves if piece.color == 'white' else -moves
+        assert value == expected
+
+def test_one_hot_planes():
+    planes = one_hot(encode_boards([Board()]))
+    assert planes.shape == (1, 12, 64)
+    assert planes.sum() == 32
+    assert planes[0, 5, 60] == 1 and planes[0, 11, 4] == 1
@@ -0,0 +1,126 @@
+# /* test_Board.py
+
+import pickle
+import random
+
+from data.classes.Board import Board, STARTING_FEN
+from data.classes.Perft import PERFT_SUITE
+from data.classes.ChessMatch import run_match
+from data.classes.GameRecord import parse_move
+from data.classes.agents.ChessAgent import ChessAgent
+
+# Shortest known stalemate (Sam Loyd) and fool's mate, in coordinates
+STALEMATE_LINE = ('e2e3 a7a5 d1h5 a8a6 h5a5 h7h5 h2h4 a6h6 a5c7 f7f6 '
+                  'c7d7 e8f7 d7b7 d8d3 b7b8 d3h7 b8c8 f7g6 c8e6').split()
+FOOLS_MATE_LINE = 'f2f3 e7e5 g2g4 d8h4'.split()
+
+class ScriptedPlayer(ChessAgent):
+    # Plays the moves of a fixed line for its color, then gives up
+    def __init__(self, color, line: list[str]):
+        super().__init__(color)
+        self.moves = iter(line[0 if color == 'white' else 1::2])
+
+    def choose_action(self, board: Board):
+        text = next(self.moves, None)
+        return False if text is None else parse_move(board, text)
+
+def play(board: Board, line: str):
+    for text in line.split():
+        board.make_move(parse_move(board, text))
+
+def test_unmake_restores_repetitions_and_halfmove():
+    rng = random.Random(0)
+    board = Board()
+    history = []
+    for _ in range(200):
+        moves = board.get_all_valid_moves(board.turn)
+        if len(moves) < 1:
+            break
+        history.append((dict(board.repetitions), board.halfmove, board.hash))
+        board.make_move(rng.choice(moves))
+        assert board.repetitions[board.hash] >= 1
+    while len(history) > 0:
+        board.unmake_move()
+        assert (dict(board.repetitions), board.halfmove, board.hash) == history.pop()
+    assert board.repetitions == {board.hash: 1} and board.halfmove == 0
+
+def test_halfmove_clock_resets_on_pawn_moves_and_captures():
+    board = Board()
+    play(board, 'g1f3 b8c6 f3g1')
+    assert board.halfmove == 3
+    play(board, 'e7e5')
+    assert board.halfmove == 0
+    play(board, 'g1f3 c6d4 f3d4')
+    assert board.halfmove == 0
+
+def test_threefold_repetition():
+    board = Board()
+    play(board, 'g1f3 g8f6 f3g1 f6g8 g1f3 g8f6 f3g1')
+    assert not board.is_threefold_repetition()
+    play(board, 'f6g8')
+    assert board.is_threefold_repetition()
+    board.unmake_move()
+    assert not board.is_threefold_repetition()
+
+def test_fifty_move_rule():
+    board = Board.from_fen('4k3/8/8/8/8/8/4P3/4K3 w - - 99 80')
+    assert board.halfmove == 99 and not board.is_fifty_move_draw()
+    play(board, 'e1d1')
+    assert board.is_fifty_move_draw()
+    board.unmake_move()
+    play(board, 'e2e4')
+    assert board.halfmove == 0 and not board.is_fifty_move_draw()
+
+def test_run_match_checkmate_and_stalemate():
+    result = run_match(ScriptedPlayer('white', FOOLS_MATE_LINE),
+                       ScriptedPlayer('black', FOOLS_MATE_LINE))
+    assert (result.winner, result.termination) == ('black', 'checkmate')
+    assert result.moves == FOOLS_MATE_LINE
+    result = run_match(ScriptedPlayer('white', STALEMATE_LINE),
+                       ScriptedPlayer('black', STALEMATE_LINE))
+    assert (result.winner, result.termination) == (None, 'stalemate')
+    assert len(result.moves) == len(STALEMATE_LINE)
+
+class FixedPlayer(ChessAgent):
+    # Always plays the same square indices, legal or not
+    def __init__(self, color, from_index: int, to_index: int):
+        super().__init__(color)
+        self.indices = (from_index, to_index)
+
+    def choose_action(self, board: Board):
+        return board.squares[self.indices[0]], board.squares[self.indices[1]]
+
+def test_run_match_invalid_moves():
+    # e4 is empty, and e7 holds black's pawn
+    for from_index, to_index in ((36, 28), (12, 28), (52, 20)):
+        result = run_match(FixedPlayer('white', from_index, to_index),
+                           ScriptedPlayer('black', FOOLS_MATE_LINE))
+        assert (result.winner, result.termination) == ('black', 'invalid_move')
+        assert result.moves == []
+
+def test_run_match_repetition():
+    line = 'g1f3 g8f6 f3g1 f6g8 g1f3 g8f6 f3g1 f6g8 g1f3'.split()
+    result = run_match(ScriptedPlayer('white', line), ScriptedPlayer('black', line))
+    assert (result.winner, result.termination) == (None, 'repetition')
+    assert len(result.moves) == 8
+
+def test_fen_round_trip():
+    for _, fen, _ in PERFT_SUITE:
+        assert Board.from_fen(fen).to_fen() == fen
+    board = Board.from_fen('4k3/8/8/8/8/8/4P3/4K3 b - - 37 80')
+    assert board.to_fen() == '4k3/8/8/8/8/8/4P3/4K3 b - - 37 80'
+    board = Board()
+    play(board, 'e2e4 e7e5 g1f3 b8c6 f1c4 g8f6 e1g1')
+    assert board.to_fen() == 'r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQ1RK1 b kq - 5 4'
+    assert Board.from_fen(board.to_fen()).hash == board.hash
+    assert Board.from_fen(STARTING_FEN).hash == Board().hash
+
+def test_pickle_keeps_position_and_repetitions():
+    board = Board()
+    play(board, 'g1f3 g8f6 f3g1 f6g8 e2e4')
+    copy = pickle.loads(pickle.dumps(board))
+    assert copy.to_fen() == board.to_fen()
+    assert copy.hash == board.hash and copy.turn == board.turn
+    assert copy.repetitions == board.repetitions
+    assert copy.halfmove == board.halfmove
+    assert len(copy.get_all_valid_moves(copy.turn)) == len(board.get_all_valid_moves(board.turn))
@@ -0,0 +1,37 @@
+# /* test_GameRecord.py
+
+import io
+import json
+
+from data.classes.Board import Board
+from data.classes.ChessMatch import run_match
+from data.classes.GameRecord import game_record, format_pgn, read_pgn, replay
+from data.classes.test_Board import ScriptedPlayer
+
+# Black to move, and mated by the rook after one more move each
+FEN = '6k1/5ppp/8/8/8/8/5PPP/R5K1 b - - 3 12'
+
+def test_game_from_fen_round_trips_through_pgn_and_jsonl():
+    # ScriptedPlayer takes the even entries for white and the odd for black
+    result = run_match(ScriptedPlayer('white', ['a1a8']), ScriptedPlayer('black', ['', 'g8h8']),
+                       fen=FEN)
+    assert (result.winner, result.termination) == ('white', 'checkmate')
+    assert result.fen == FEN and result.moves == ['g8h8', 'a1a8']
+    record = game_record(result)
+    assert record['fen'] == FEN and record['san'] == ['Kh8', 'Ra8#']
+    pgn = format_pgn(record)
+    assert '[SetUp "1"]' in pgn and f'[FEN "{FEN}"]' in pgn
+    assert '12... Kh8 13. Ra8# 1-0' in pgn
+    final = replay(record).to_fen()
+    for copy in (next(read_pgn(io.StringIO(pgn))), json.loads(json.dumps(record))):
+        assert copy['fen'] == FEN
+        assert replay(copy).to_fen() == final
+
+def test_game_from_start_has_no_fen_tag():
+    line = ['e2e4', 'e7e5']
+    result = run_match(ScriptedPlayer('white', line), ScriptedPlayer('black', line))
+    record = game_record(result)
+    assert record['fen'] is None
+    pgn = format_pgn(record)
+    assert 'FEN' not in pgn and '1. e4 e5' in pgn
+    assert replay(next(read_pgn(io.StringIO(pgn)))).to_fen() == replay(record).to_fen()
@@ -0,0 +1,54 @@
+# /* test_Move.py
+
+from data.classes.Board import Board
+from data.classes.Perft import PERFT_SUITE
+from data.classes.Move import CASTLING, KIND_MASK, is_promotion, move_buffer
+
+def suite_positions(backend: str) -> list[Board]:
+    # The suite positions and every position one move after them
+    boards = []
+    for _, fen, _ in PERFT_SUITE:
+        board = Board.from_fen(fen, backend=backend)
+        boards.append(board)
+        for move in board.get_all_valid_moves(board.turn):
+            child = Board.from_fen(fen, backend=backend)
+            child.make_move(child.decode_move(board.encode_move(move)))
+            boards.append(child)
+    return boards
+
+def generated(board: Board, captures_only: bool = False) -> list[int]:
+    buffer = move_buffer()
+    count = board.generate_move_codes(buffer, captures_only)
+    return buffer[:count].tolist()
+
+def test_codes_match_encoded_valid_moves():
+    for backend in ('bitboard', 'squares'):
+        for board in suite_positions(backend):
+            expected = [board.encode_move(move) for move in board.get_all_valid_moves(board.turn)]
+            assert generated(board) == expected
+            captures = [board.encode_move(move) for move in board.get_all_valid_captures(board.turn)]
+            assert sorted(generated(board, captures_only=True)) == sorted(captures)
+
+def test_promotion_and_castling_flags():
+    kinds = set()
+    for board in suite_positions('bitboard'):
+        for code in generated(board):
+            from_square, to_square = board.decode_move(code)
+            piece = from_square.occupying_piece
+            assert is_promotion(code) == (piece.notation == ' ' and to_square.y in (0, 7))
+            assert (code & KIND_MASK == CASTLING) == \
+                (piece.notation == 'K' and abs(from_square.x - to_square.x) == 2)
+            kinds.add(code & KIND_MASK)
+    # the suite has both kinds of flagged moves
+    assert len(kinds) == 3
+
+def test_make_move_code_matches_make_move():
+    for _, fen, _ in PERFT_SUITE:
+        board = Board.from_fen(fen)
+        for code in generated(board):
+            other = Board.from_fen(fen)
+            board.make_move_code(code)
+            other.make_move(other.decode_move(code))
+            assert board.hash == other.hash and board.to_fen() == other.to_fen()
+            board.unmake_move()
+            assert board.to_fen() == fen
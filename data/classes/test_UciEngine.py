@@ -0,0 +1,99 @@
+# /* test_UciEngine.py
+
+import io
+import time
+
+from data.classes.UciEngine import UciEngine, uci_score, INFINITE_TIME, MOVE_OVERHEAD
+from data.classes.GameRecord import parse_move
+from data.classes.agents.MinimaxPlayer import MinimaxPlayer, MATE_SCORE
+from data.classes.agents.RandomPlayer import RandomPlayer
+
+MATE_IN_ONE = '6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1'
+
+def engine_for(agent=None) -> tuple[UciEngine, io.StringIO]:
+    output = io.StringIO()
+    return UciEngine(agent or MinimaxPlayer('white', tt_size_mb=1), output=output), output
+
+def lines(output: io.StringIO) -> list[str]:
+    return output.getvalue().splitlines()
+
+def test_handshake():
+    engine, output = engine_for()
+    assert engine.handle('uci') and engine.handle('isready')
+    assert lines(output)[-2:] == ['uciok', 'readyok']
+    assert lines(output)[0].startswith('id name ')
+    assert not engine.handle('quit')
+
+def test_position_with_moves():
+    engine, output = engine_for()
+    engine.handle('position startpos moves e2e4 e7e5 g1f3')
+    assert engine.board.to_fen() == 'rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2'
+    engine.handle(f'position fen {MATE_IN_ONE} moves a1b1')
+    assert engine.board.turn == 'black'
+    assert output.getvalue() == ''
+
+def test_illegal_move_stops_the_move_list():
+    engine, output = engine_for()
+    engine.handle('position startpos moves e2e4 e7e4 g1f3')
+    assert lines(output) == ['info string illegal move e7e4']
+    assert engine.board.to_fen() == 'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1'
+
+def test_go_depth_reports_info_and_bestmove():
+    engine, output = engine_for()
+    engine.handle('position startpos moves e2e4')
+    engine.handle('go depth 2')
+    engine.search.join(30)
+    infos = [line for line in lines(output) if line.startswith('info depth')]
+    assert [line.split()[2] for line in infos] == ['1', '2']
+    assert all(' nodes ' in line and ' nps ' in line and ' pv ' in line for line in infos)
+    best = lines(output)[-1].split()
+    assert best[0] == 'bestmove'
+    parse_move(engine.board, best[1])
+
+def test_go_infinite_waits_for_stop():
+    engine, output = engine_for()
+    engine.handle(f'position fen {MATE_IN_ONE}')
+    engine.handle('go infinite')
+    time.sleep(0.3)
+    assert engine.handle('isready')
+    assert not any(line.startswith('bestmove') for line in lines(output))
+    assert 'readyok' in lines(output)
+    engine.handle('stop')
+    assert lines(output)[-1] == 'bestmove a1a8'
+    assert any('score mate 1' in line for line in lines(output))
+    # the final info line times the search, not the wait for stop
+    final = lines(output)[-2].split()
+    assert final[0] == 'info' and int(final[final.index('time') + 1]) < 250
+
+def test_stop_ends_a_long_search():
+    engine, output = engine_for()
+    engine.handle('position startpos')
+    engine.handle('go movetime 60000')
+    time.sleep(0.2)
+    start = time.perf_counter()
+    engine.handle('stop')
+    assert time.perf_counter() - start < 2.0
+    assert lines(output)[-1].startswith('bestmove ')
+
+def test_search_limits():
+    engine, _ = engine_for()
+    assert engine.search_limits([]) == {}
+    assert engine.search_limits(['infinite']) == {'time_limit': INFINITE_TIME}
+    assert engine.search_limits(['movetime', '1000']) == {'time_limit': (1000 - MOVE_OVERHEAD) / 1000}
+    assert engine.search_limits(['depth', '5']) == {'time_limit': None, 'depth': 5}
+    assert engine.search_limits(['nodes', '5000']) == {'node_limit': 5000}
+    # white to move: btime is the opponent's clock
+    limits = engine.search_limits(['wtime', '60000', 'btime', '1000', 'movestogo', '20'])
+    assert limits == {'time_limit': 3.0}
+    engine.handle('position startpos moves e2e4')
+    limits = engine.search_limits(['wtime', '60000', 'btime', '1000', 'binc', '100'])
+    assert 0 < limits['time_limit'] <= 0.475
+    # an agent without these keywords gets its own budget
+    engine, _ = engine_for(RandomPlayer('white'))
+    assert engine.search_limits(['wtime', '60000', 'btime', '60000', 'depth', '4']) == {}
+
+def test_uci_score():
+    assert uci_score(35) == 'cp 35'
+    assert uci_score(MATE_SCORE - 1) == 'mate 1'
+    assert uci_score(MATE_SCORE - 3) == 'mate 2'
+    assert uci_score(-MATE_SCORE + 2) == 'mate -1'
@@ -1,9 +1,12 @@
 import argparse
 
-from data.classes.ChessMatch import chess_match
+from data.classes.ChessMatch import chess_match, run_match, iter_matches, MatchResult
+from data.classes.Profiler import run_profiled
+from data.classes.GameRecord import GameRecordWriter
 from data.classes.agents.RandomPlayer import RandomPlayer
 from data.classes.agents.HumanPlayer import HumanPlayer
 from data.classes.agents.MinimaxPlayer import MinimaxPlayer
+from data.classes.agents.MCTSPlayer import MCTSPlayer
 from data.classes.agents.ChessAgent import ChessAgent
 
 import os 
@@ -15,6 +18,20 @@ def main():
     parser = argparse.ArgumentParser(description="Initialize players for the game.")
     parser.add_argument('white', type=str, help="Type of the white player")
     parser.add_argument('black', type=str, help="type of the black player")
+    parser.add_argument('--games', type=int, default=None,
+                        help="Play this many headless games and print a summary")
+    parser.add_argument('--seed', type=int, default=None, help="Seed for the first game")
+    parser.add_argument('--max-moves', type=int, default=1000,
+                        help="Draw the game after this many moves")
+    parser.add_argument('--profile', nargs='?', const='profile', default=None, metavar='PREFIX',
+                        help="Play one game without a window and report where the time goes; "
+                             "writes PREFIX.prof and PREFIX.folded")
+    parser.add_argument('--no-render', action='store_true',
+                        help="With --profile, skip drawing the board")
+    parser.add_argument('--record', type=str, default=None, metavar='PATH',
+                        help="Append the games to PATH as PGN (.pgn) or JSON lines")
+    parser.add_argument('--fen', type=str, default=None,
+                        help="Start the games from this position instead of the usual one")
     args = parser.parse_args()
     if args.white not in globals().keys():
         print(f'White player {args.white} not found!')
@@ -24,7 +41,51 @@ def main():
         return
     white_player: ChessAgent = globals()[args.white]('white')
     black_player: ChessAgent = globals()[args.black]('black')
-    chess_match(white_player, black_player)
+    if args.profile is not None:
+        if isinstance(white_player, HumanPlayer) or isinstance(black_player, HumanPlayer):
+            print('HumanPlayer cannot be profiled')
+            return
+        # Render to an off-screen surface so drawing is measured without a window
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        result = run_profiled(args.profile, run_match, white_player, black_player,
+                              seed=args.seed, max_moves=args.max_moves,
+                              display=not args.no_render, fen=args.fen)
+        print(f'{result.result} by {result.termination} after {len(result.moves)} moves')
+        return
+    # Games are written as they finish, so an interrupted run keeps them
+    writer = GameRecordWriter(args.record) if args.record is not None else None
+    try:
+        if args.games is None:
+            result = chess_match(white_player, black_player, args.fen)
+            if writer is not None:
+                writer.write(result, game=0)
+        else:
+            results = []
+            for i, result in enumerate(iter_matches(args.games, white_player, black_player,
+                                                    seed=args.seed, max_moves=args.max_moves,
+                                                    fen=args.fen)):
+                results.append(result)
+                if writer is not None:
+                    writer.write(result, game=i)
+            print_summary(results)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def print_summary(results: list[MatchResult]):
+    white_wins = sum(1 for result in results if result.winner == 'white')
+    black_wins = sum(1 for result in results if result.winner == 'black')
+    print(f'{len(results)} games: white {white_wins}, black {black_wins}, '
+          f'draws {len(results) - white_wins - black_wins}')
+    terminations: dict[str, int] = {}
+    for result in results:
+        terminations[result.termination] = terminations.get(result.termination, 0) + 1
+    print('terminations:', ', '.join(f'{name} {count}' for name, count in terminations.items()))
+    if len(results) > 0:
+        print(f'average length: {sum(len(result.moves) for result in results) / len(results):.1f} moves')
+        for color in ('white', 'black'):
+            latency = sum(result.mean_latency(color) for result in results) / len(results)
+            print(f'{color} mean move time: {latency * 1000:.2f} ms')
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,47 @@
+import argparse
+import itertools
+import os
+import sys
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from data.classes.Board import Board, STARTING_FEN
+from data.classes.GameRecord import read_records
+from data.classes.OpeningBook import OpeningBook, build_book
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect an opening book.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="build a book from PGN or JSON lines game files")
+    build.add_argument('games', nargs='+', type=str, help="game record files")
+    build.add_argument('-o', '--output', type=str, default='book.bin')
+    build.add_argument('--plies', type=int, default=20,
+                       help="book moves taken from the start of each game")
+    build.add_argument('--min-weight', type=int, default=1,
+                       help="leave out moves with a lower total weight (win 2, draw 1)")
+    probe = commands.add_parser('probe', help="list the book moves of a position")
+    probe.add_argument('book', type=str)
+    probe.add_argument('--fen', type=str, default=STARTING_FEN)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        records = itertools.chain.from_iterable(read_records(path) for path in args.games)
+        count = build_book(records, args.output, args.plies, args.min_weight)
+        print(f'{count} entries written to {args.output} in {time.perf_counter() - start:.1f}s')
+        return 0
+
+    book = OpeningBook(args.book)
+    board = Board.from_fen(args.fen)
+    start = time.perf_counter()
+    entries = book.probe(board.hash)
+    elapsed = time.perf_counter() - start
+    for code, weight, games in entries:
+        from_square, to_square = board.decode_move(code)
+        print(f'{from_square.coord}{to_square.coord}  weight {weight:>5}  games {games:>6}')
+    print(f'{len(entries)} moves ({len(book)} entries, lookup {elapsed * 1e6:.0f}us)')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import sys
+
+from data.classes.Board import Board
+from data.classes.Perft import PERFT_SUITE, divide, timed_perft
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perft_baseline.json')
+
+def run_suite(backend: str, max_depth: int) -> dict:
+    results = {}
+    for name, fen, counts in PERFT_SUITE:
+        depth = min(max(counts), max_depth)
+        nodes, nps = timed_perft(Board.from_fen(fen, backend=backend), depth)
+        results[name] = {'depth': depth, 'nodes': nodes, 'expected': counts[depth], 'nps': nps}
+        status = 'ok' if nodes == counts[depth] else 'WRONG (expected %d)' % counts[depth]
+        print(f'{name:<10} depth {depth}  {nodes:>9} nodes  {nps:>10.0f} nodes/s  {status}')
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Move generation benchmark and correctness suite.")
+    parser.add_argument('--fen', type=str, help="run a single position instead of the suite")
+    parser.add_argument('--depth', type=int, default=None, help="perft depth (suite: maximum depth)")
+    parser.add_argument('--divide', action='store_true', help="print node counts per root move")
+    parser.add_argument('--backend', choices=['bitboard', 'squares'], default='bitboard')
+    parser.add_argument('--baseline', type=str, default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed nodes/s drop relative to the baseline")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="record this run's nodes/s as the new baseline")
+    args = parser.parse_args()
+
+    if args.fen is not None:
+        board = Board.from_fen(args.fen, backend=args.backend)
+        depth = args.depth or 3
+        if args.divide:
+            split = divide(board, depth)
+            for move, nodes in sorted(split.items()):
+                print(f'{move}: {nodes}')
+            print(f'\nMoves: {len(split)}')
+        nodes, nps = timed_perft(board, depth)
+        print(f'Nodes: {nodes}  ({nps:.0f} nodes/s)')
+        return 0
+
+    results = run_suite(args.backend, args.depth or 99)
+    failed = [name for name, result in results.items() if result['nodes'] != result['expected']]
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if args.update_baseline:
+        baseline[args.backend] = {
+            name: {'depth': result['depth'], 'nodes': result['nodes'], 'nps': round(result['nps'])}
+            for name, result in results.items()
+        }
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+            f.write('\n')
+        print(f'Baseline written to {args.baseline}')
+    else:
+        for name, result in results.items():
+            reference = baseline.get(args.backend, {}).get(name)
+            if reference is None or reference['depth'] != result['depth']:
+                continue
+            if result['nps'] < reference['nps'] * (1 - args.tolerance):
+                print(f'{name}: {result["nps"]:.0f} nodes/s is more than '
+                      f'{args.tolerance:.0%} below the baseline {reference["nps"]}')
+                failed.append(name)
+
+    if failed:
+        print('FAILED: ' + ', '.join(failed))
+        return 1
+    print('All positions passed')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import argparse
+import itertools
+import os
+import sys
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from data.classes.Board import Board
+from data.classes.GameRecord import read_records, replay
+
+def diagram(board: Board) -> str:
+    rows = []
+    for y in range(8):
+        row = []
+        for x in range(8):
+            piece = board.get_piece_from_pos((x, y))
+            if piece is None:
+                row.append('.')
+            else:
+                letter = 'P' if piece.notation == ' ' else piece.notation
+                row.append(letter if piece.color == 'white' else letter.lower())
+        rows.append(f'{8 - y} ' + ' '.join(row))
+    rows.append('  a b c d e f g h')
+    return '\n'.join(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded games on a headless board.")
+    parser.add_argument('path', type=str, help="PGN (.pgn) or JSON lines game record file")
+    parser.add_argument('--game', type=int, default=None,
+                        help="replay only the game at this position in the file (from 0)")
+    parser.add_argument('--plies', type=int, default=None,
+                        help="stop after this many moves")
+    parser.add_argument('--quiet', action='store_true',
+                        help="only check that every game replays")
+    args = parser.parse_args()
+
+    records = read_records(args.path)
+    if args.game is not None:
+        records = itertools.islice(records, args.game, args.game + 1)
+    count = 0
+    for record in records:
+        try:
+            board = replay(record, args.plies)
+        except ValueError as error:
+            print(f'Game {record.get("game", count)}: {error}')
+            return 1
+        count += 1
+        if args.quiet:
+            continue
+        print(f'Game {record.get("game", "?")}: {record["white"]} - {record["black"]} '
+              f'{record["result"]} ({record["termination"]}, seed {record["seed"]})')
+        print(' '.join(record['san'][:args.plies]))
+        print(diagram(board))
+        print(board.to_fen())
+        print(f'{board.turn} to move after {len(board.move_stack)} moves\n')
+    print(f'{count} games replayed')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
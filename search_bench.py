@@ -0,0 +1,51 @@
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from data.classes.Board import Board
+from data.classes.Perft import PERFT_SUITE
+from data.classes.agents.MinimaxPlayer import MinimaxPlayer
+
+def run(workers: int, depth: int, tt_size_mb: float, positions: list[tuple[str, str]]) -> float:
+    player = MinimaxPlayer('white', tt_size_mb=tt_size_mb, workers=workers)
+    total = 0.0
+    try:
+        for name, fen in positions:
+            player.tt.clear()
+            board = Board.from_fen(fen)
+            player.color = board.turn
+            start = time.perf_counter()
+            move = player.choose_action(board, depth=depth)
+            elapsed = time.perf_counter() - start
+            total += elapsed
+            print(f'  {name:<10} {move[0].coord}{move[1].coord}  score {player.stats.score:>7}  '
+                  f'{player.stats.nodes:>8} nodes  {elapsed:7.2f}s')
+    finally:
+        player.close()
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time MinimaxPlayer to a fixed depth with different numbers of search processes.")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                        help="process counts to compare; the first is the reference")
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--tt-size', type=float, default=64, help="table size in MB")
+    parser.add_argument('--fen', type=str, help="time a single position instead of the suite")
+    args = parser.parse_args()
+
+    positions = [('fen', args.fen)] if args.fen else [(name, fen) for name, fen, _ in PERFT_SUITE]
+    print(f'{os.cpu_count()} cores, depth {args.depth}')
+    reference = None
+    for workers in args.workers:
+        print(f'{workers} worker(s):')
+        total = run(workers, args.depth, args.tt_size, positions)
+        reference = total if reference is None else reference
+        print(f'  total {total:.2f}s  speedup {reference / total:.2f}x')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
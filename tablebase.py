@@ -0,0 +1,51 @@
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from data.classes.Board import Board
+from data.classes.Tablebase import Tablebases, generate, THREE_PIECE_TABLES
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate or probe endgame tablebases.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('generate', help="build tables and the smaller ones they need")
+    build.add_argument('tables', nargs='*', type=str, default=THREE_PIECE_TABLES,
+                       help="material sets such as KQK or KRKN (default: every three-piece table)")
+    build.add_argument('--dir', type=str, default='tablebases')
+    probe = commands.add_parser('probe', help="look up a position")
+    probe.add_argument('fen', type=str)
+    probe.add_argument('--dir', type=str, default='tablebases')
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        tables = {}
+        for name in args.tables:
+            try:
+                generate(name, args.dir, tables)
+            except ValueError as error:
+                print(error)
+                return 1
+        return 0
+
+    tablebases = Tablebases(args.dir)
+    board = Board.from_fen(args.fen)
+    start = time.perf_counter()
+    value = tablebases.probe(board)
+    elapsed = time.perf_counter() - start
+    if value is None:
+        print('not in the tables')
+        return 1
+    if value > 0:
+        print(f'{board.turn} wins, mate in {value} plies')
+    elif value < 0:
+        print(f'{board.turn} loses, mated in {-value - 1} plies')
+    else:
+        print('draw')
+    print(f'lookup {elapsed * 1e6:.0f}us')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
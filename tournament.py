@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from data.classes.Tournament import iter_tournament, Standings
+from data.classes.GameRecord import GameRecordWriter
+from data.classes.Profiler import run_profiled
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless games between agents on all cores.")
+    parser.add_argument('agents', nargs='+', type=str,
+                        help="agent specs, e.g. RandomPlayer or "
+                             "'MinimaxPlayer:time_limit=None,node_limit=20000'; "
+                             "three or more play a round robin")
+    parser.add_argument('--games', type=int, default=100,
+                        help="games per ordered pairing (each colour assignment)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game")
+    parser.add_argument('--max-moves', type=int, default=1000,
+                        help="draw a game after this many moves")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument('--profile', nargs='?', const='profile', default=None, metavar='PREFIX',
+                        help="play the games in this process under the profiler; "
+                             "writes PREFIX.prof and PREFIX.folded")
+    parser.add_argument('--record', type=str, default=None, metavar='PATH',
+                        help="append every game to PATH as PGN (.pgn) or JSON lines")
+    args = parser.parse_args()
+
+    standings = Standings()
+    writer = GameRecordWriter(args.record) if args.record is not None else None
+
+    def play(workers: int):
+        # Results are tallied and written as they arrive, never kept
+        for index, result in iter_tournament(args.agents, args.games, args.seed,
+                                             args.max_moves, workers):
+            standings.add(result)
+            if writer is not None:
+                writer.write(result, game=index)
+
+    start = time.perf_counter()
+    try:
+        if args.profile is not None:
+            # cProfile only sees this process, so play the games here
+            run_profiled(args.profile, play, 1)
+        else:
+            play(args.workers)
+    except ValueError as error:
+        print(error)
+        return 1
+    finally:
+        if writer is not None:
+            writer.close()
+    elapsed = time.perf_counter() - start
+    print(standings.format())
+    print(f'{standings.games} games in {elapsed:.1f}s '
+          f'({standings.games / elapsed:.2f} games/s)')
+    if writer is not None:
+        print(f'{writer.games} games written to {args.record}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,38 @@
+import argparse
+import os
+import sys
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from data.classes.UciEngine import UciEngine
+from data.classes.agents.ChessAgent import ChessAgent
+from data.classes.agents.RandomPlayer import RandomPlayer
+from data.classes.agents.MinimaxPlayer import MinimaxPlayer
+from data.classes.agents.MCTSPlayer import MCTSPlayer
+
+AGENTS = {agent.__name__: agent for agent in (MinimaxPlayer, MCTSPlayer, RandomPlayer)}
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run an agent as a UCI engine on stdin/stdout, for chess GUIs and match tools.")
+    parser.add_argument('agent', nargs='?', type=str, default='MinimaxPlayer', choices=AGENTS)
+    parser.add_argument('--tt-size', type=float, default=64, help="MinimaxPlayer table size in MB")
+    parser.add_argument('--workers', type=int, default=1, help="MinimaxPlayer search processes")
+    parser.add_argument('--book', type=str, default=None, help="MinimaxPlayer opening book file")
+    parser.add_argument('--tablebases', type=str, default=None,
+                        help="MinimaxPlayer endgame table directory")
+    args = parser.parse_args()
+
+    if args.agent == 'MinimaxPlayer':
+        agent: ChessAgent = MinimaxPlayer('white', tt_size_mb=args.tt_size, workers=args.workers,
+                                          book=args.book, tablebases=args.tablebases)
+    else:
+        agent = AGENTS[args.agent]('white')
+    try:
+        return UciEngine(agent).run()
+    finally:
+        if isinstance(agent, MinimaxPlayer):
+            agent.close()
+
+if __name__ == '__main__':
+    sys.exit(main())